@@ -1,34 +1,319 @@
 # Copyright (c) 2025, itsyosefali and contributors
 # For license information, please see license.txt
 
+import json
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote, urlencode
+
 import frappe
 import requests
 from frappe import _
+from frappe.utils import cint
+from frappe.utils.password import set_encrypted_password
+from requests.adapters import HTTPAdapter
+
+try:
+	import orjson
+except ImportError:
+	orjson = None
+
+# Shared session so keep-alive reuses TCP/TLS connections to Zoho
+# instead of paying a fresh handshake on every call
+_session = requests.Session()
+_adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=0)
+_session.mount("https://", _adapter)
+
+# Bound how long a stalled Zoho endpoint can hold a worker
+_CONNECT_TIMEOUT, _READ_TIMEOUT = 5.0, 30.0
+_TIMEOUT = (_CONNECT_TIMEOUT, _READ_TIMEOUT)
+
+_SUPPORTED_METHODS = frozenset(("GET", "POST", "PUT", "DELETE"))
+
+# Zoho Books caps per_page at 200
+MAX_PER_PAGE = 200
+
+# List pages requested at once by iter_zoho_pages; kept small so a full
+# sync stays well inside Zoho's per-minute rate limit
+PAGE_FETCH_WORKERS = 4
+
+# Transient failures worth retrying: rate limiting and gateway errors
+_RETRY_STATUS_CODES = {429, 502, 503, 504}
+_MAX_RETRY_AFTER = 60
+
+# Zoho Books allows 100 API calls per minute per organization. Calls are
+# counted in a per-minute Redis window shared by all workers and held back
+# once the budget is spent, rather than being sent only to come back 429.
+_RATE_LIMIT_PER_MINUTE = 100
+_RATE_WINDOW_KEY = "zoho_rate_window"
+
+# Zoho access tokens live for an hour; keep them in memory per site and
+# refresh a few minutes before they expire. The token is also shared through
+# Redis so every worker reuses the one refreshed by whoever got there first.
+_TOKEN_EXPIRY_MARGIN = 300
+_TOKEN_CACHE_KEY = "zoho_access_token"
+_REFRESH_LOCK_KEY = "zoho_token_refresh"
+_REFRESH_LOCK_TIMEOUT = 30
+_REFRESH_LOCK_WAIT = 5
+_token_cache = {}
+_token_lock = threading.Lock()
+
+
+def _get_cached_token():
+	"""
+	Return the cached access token for the current site if it is still fresh,
+	falling back to the token shared by other workers through Redis
+	"""
+	entry = _token_cache.get(frappe.local.site)
+	if entry and time.monotonic() < entry["expires_at"] - _TOKEN_EXPIRY_MARGIN:
+		return entry["access_token"]
+	
+	shared = frappe.cache().get_value(_TOKEN_CACHE_KEY)
+	if shared and time.time() < shared["expires_at"] - _TOKEN_EXPIRY_MARGIN:
+		_token_cache[frappe.local.site] = {
+			"access_token": shared["access_token"],
+			"expires_at": time.monotonic() + shared["expires_at"] - time.time()
+		}
+		return shared["access_token"]
+	
+	return None
+
+
+def _set_cached_token(access_token, expires_in):
+	_token_cache[frappe.local.site] = {
+		"access_token": access_token,
+		"expires_at": time.monotonic() + expires_in
+	}
+	frappe.cache().set_value(
+		_TOKEN_CACHE_KEY,
+		{"access_token": access_token, "expires_at": time.time() + expires_in},
+		expires_in_sec=expires_in
+	)
+
+
+def parse_zoho_response(response):
+	"""
+	Decode a Zoho JSON response body in one pass over the raw bytes.
+	
+	Uses orjson when it is installed (Frappe ships it), otherwise falls back
+	to requests' own decoder. List pages run to a few MB, where orjson is
+	several times faster than the stdlib json module.
+	"""
+	if orjson is not None:
+		try:
+			return orjson.loads(response.content)
+		except orjson.JSONDecodeError as e:
+			# Raise what response.json() would, so the callers'
+			# RequestException handlers still catch a non-JSON body
+			raise requests.exceptions.JSONDecodeError(e.msg, e.doc, e.pos) from e
+	
+	return response.json()
+
+
+def encode_json_body(json_data, headers):
+	"""
+	Serialise a JSON request body, with orjson when it is installed, and
+	set the JSON content type on headers (in place) if none is given.
+	"""
+	headers.setdefault("Content-Type", "application/json")
+	
+	if orjson is not None:
+		return orjson.dumps(json_data, default=str)
+	
+	return json.dumps(json_data, default=str)
+
+
+def describe_http_error(error):
+	"""
+	Summarise a requests HTTPError for logs and messages, keeping only the
+	start of the response body (Zoho error bodies can be very large).
+	"""
+	response = error.response
+	return f"HTTP {response.status_code}: {response.text[:512]}"
+
+
+def log_zoho_error(title, message):
+	"""
+	Queue an Error Log entry instead of inserting it synchronously.
+	
+	Deferred inserts are buffered in Redis and written in bulk by Frappe's
+	scheduler, so error bursts (rate limits, outages) don't serialize on
+	the Error Log table, and the entry survives a rollback of the request.
+	"""
+	frappe.log_error(title=title, message=message, defer_insert=True)
+
+
+def get_zoho_logger():
+	"""
+	Return the site's zoho_integration file logger, for routine events that
+	do not belong in the Error Log.
+	"""
+	return frappe.logger("zoho_integration", allow_site=True, file_count=5)
+
+
+def log_zoho_debug(message):
+	"""
+	Write a diagnostic line to the zoho_integration log file when Debug
+	Logging is enabled in Zoho Books Settings. Nothing touches the database.
+	"""
+	if not get_settings().debug_logging:
+		return
+	
+	logger = get_zoho_logger()
+	logger.setLevel(logging.DEBUG)
+	logger.debug(message)
+
+
+def get_settings():
+	"""
+	Return the Zoho Books Settings doc from Frappe's document cache.
+	
+	The cached doc is shared across requests (Redis) and within a request
+	(frappe.local), so it must only be read; load a fresh doc to save.
+	"""
+	return frappe.get_cached_doc("Zoho Books Settings", "Zoho Books Settings")
+
+
+def clear_settings_cache():
+	"""
+	Drop the cached Zoho Books Settings doc
+	"""
+	frappe.clear_document_cache("Zoho Books Settings", "Zoho Books Settings")
+
+
+def _get_retry_after(response):
+	"""
+	Return the Retry-After delay in seconds sent by Zoho, if any
+	"""
+	retry_after = response.headers.get("Retry-After")
+	if not retry_after:
+		return None
+	try:
+		return min(max(float(retry_after), 0), _MAX_RETRY_AFTER)
+	except ValueError:
+		return None
+
+
+def _retry(send, idempotent=True, max_attempts=4, initial=0.5, multiplier=2.0, cap=8.0, jitter=0.5):
+	"""
+	Call send() and retry transient failures with exponential backoff and jitter.
+	
+	Connection errors, timeouts and 429/502/503/504 responses are retried,
+	honouring Retry-After when present. Non-idempotent requests are only
+	retried when Zoho cannot have processed them (429 or a connect timeout).
+	
+	Returns the last response; the last network error is re-raised.
+	"""
+	for attempt in range(max_attempts):
+		is_last_attempt = attempt == max_attempts - 1
+		delay = None
+		
+		try:
+			response = send()
+		except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+			if is_last_attempt or not (idempotent or isinstance(e, requests.exceptions.ConnectTimeout)):
+				raise
+		else:
+			if is_last_attempt or response.status_code not in _RETRY_STATUS_CODES:
+				return response
+			if not idempotent and response.status_code != 429:
+				return response
+			delay = _get_retry_after(response)
+		
+		if delay is None:
+			delay = min(cap, initial * multiplier**attempt) * (1 + random.uniform(-jitter, jitter))
+		time.sleep(delay)
+
+
+def _get_rate_window_prefix(settings):
+	"""
+	Return the site-scoped Redis key prefix of the organization's rate window
+	"""
+	return frappe.cache().make_key(f"{_RATE_WINDOW_KEY}:{settings.organization_id}")
+
+
+def _wait_for_rate_slot(cache, prefix):
+	"""
+	Take one call from the current minute's budget, sleeping until the next
+	minute when it is used up. Safe to call from worker threads, as the
+	cache and key prefix are resolved by the caller.
+	"""
+	while True:
+		now = time.time()
+		key = f"{prefix}:{int(now // 60)}"
+		count = cache.incr(key)
+		if count == 1:
+			cache.expire(key, 120)
+		if count <= _RATE_LIMIT_PER_MINUTE:
+			return
+		time.sleep(60 - now % 60)
+
+
+def invalidate_token_cache():
+	"""
+	Drop the cached access token for the current site
+	"""
+	_token_cache.pop(frappe.local.site, None)
+	frappe.cache().delete_value(_TOKEN_CACHE_KEY)
 
-def get_valid_access_token():
+def get_valid_access_token(settings=None):
 	"""
 	Get a valid access token, automatically refreshing if needed.
 	Returns the access token string or None if refresh fails.
+	
+	Args:
+		settings: Already loaded Zoho Books Settings doc, if the caller has one
 	"""
-	settings = frappe.get_doc("Zoho Books Settings", "Zoho Books Settings")
+	access_token = _get_cached_token()
+	if access_token:
+		return access_token
 	
-	if not settings.access_token:
-		return None
+	if settings is None:
+		settings = get_settings()
 	
-	# Try to refresh the token automatically
-	refresh_result = refresh_access_token_internal()
-	if refresh_result.get("status") == "success":
-		return refresh_result.get("access_token")
+	with _token_lock:
+		# Another thread may have refreshed while we were waiting
+		access_token = _get_cached_token()
+		if access_token:
+			return access_token
+		
+		# Only one worker refreshes at a time; the others wait for its token
+		# and fall back to refreshing themselves if it takes too long
+		refresh_lock = frappe.cache().lock(
+			frappe.cache().make_key(_REFRESH_LOCK_KEY),
+			timeout=_REFRESH_LOCK_TIMEOUT,
+			blocking_timeout=_REFRESH_LOCK_WAIT
+		)
+		has_lock = refresh_lock.acquire()
+		try:
+			access_token = _get_cached_token()
+			if access_token:
+				return access_token
+			
+			# Try to refresh the token automatically
+			refresh_result = refresh_access_token_internal(settings)
+			if refresh_result.get("status") == "success":
+				return refresh_result.get("access_token")
+		finally:
+			if has_lock:
+				refresh_lock.release()
 	
 	# If refresh failed, try using existing token
 	# It might still be valid
-	return settings.get_password("access_token")
+	return settings.get_password("access_token", raise_exception=False)
 
-def refresh_access_token_internal():
+def refresh_access_token_internal(settings=None):
 	"""
 	Internal function to refresh access token (without @frappe.whitelist)
+	
+	Args:
+		settings: Already loaded Zoho Books Settings doc, if the caller has one
 	"""
-	settings = frappe.get_doc("Zoho Books Settings", "Zoho Books Settings")
+	if settings is None:
+		settings = get_settings()
 	
 	if not settings.refresh_token:
 		return {
@@ -42,6 +327,8 @@ def refresh_access_token_internal():
 			"message": "Client ID and Client Secret are not configured"
 		}
 	
+	# Decrypted on every refresh (about once an hour) rather than cached per
+	# process, so a re-authorization is picked up by every worker at once
 	client_secret = settings.get_password("client_secret")
 	refresh_token = settings.get_password("refresh_token")
 	
@@ -55,19 +342,36 @@ def refresh_access_token_internal():
 	}
 	
 	try:
-		response = requests.post(url, data=data)
-		response.raise_for_status()
+		response = _retry(lambda: _session.post(url, data=data, timeout=_TIMEOUT))
+		
+		if response.status_code >= 400:
+			error_message = f"HTTP {response.status_code}: {response.text}"
+			log_zoho_error(
+				title="Zoho Integration Issue",
+				message=f"Token refresh HTTP error: {error_message}"
+			)
+			return {
+				"status": "error",
+				"message": f"Token refresh failed: {error_message}"
+			}
+		
 		token_data = response.json()
 		
-		if "access_token" in token_data:
-			settings.access_token = token_data.get("access_token")
-			settings.save()
+		access_token = token_data.get("access_token")
+		
+		if access_token:
+			expires_in = token_data.get("expires_in", 3600)
+			# Only the encrypted token changes, so skip the full doc save
+			# (validation, hooks, re-encrypting every password field)
+			set_encrypted_password("Zoho Books Settings", "Zoho Books Settings", access_token, "access_token")
 			frappe.db.commit()
+			_set_cached_token(access_token, expires_in)
 			
 			return {
 				"status": "success",
 				"message": "Access token refreshed successfully",
-				"access_token": token_data.get("access_token")
+				"access_token": access_token,
+				"expires_in": expires_in
 			}
 		else:
 			return {
@@ -75,18 +379,8 @@ def refresh_access_token_internal():
 				"message": f"Token refresh failed: {token_data.get('error', 'Unknown error')}"
 			}
 			
-	except requests.exceptions.HTTPError as e:
-		error_message = f"HTTP {e.response.status_code}: {e.response.text}"
-		frappe.log_error(
-			title="Zoho Integration Issue",
-			message=f"Token refresh HTTP error: {error_message}"
-		)
-		return {
-			"status": "error",
-			"message": f"Token refresh failed: {error_message}"
-		}
 	except requests.exceptions.RequestException as e:
-		frappe.log_error(
+		log_zoho_error(
 			title="Zoho Integration Issue",
 			message=f"Token refresh request failed: {str(e)}"
 		)
@@ -95,7 +389,7 @@ def refresh_access_token_internal():
 			"message": f"Token refresh failed: {str(e)}"
 		}
 
-def make_zoho_api_request(method, url, headers=None, params=None, data=None, json_data=None, retry_on_401=True):
+def make_zoho_api_request(method, url, headers=None, params=None, data=None, json_data=None, retry_on_401=True, idempotent=None):
 	"""
 	Make a Zoho API request with automatic token refresh on 401 errors.
 	
@@ -107,19 +401,22 @@ def make_zoho_api_request(method, url, headers=None, params=None, data=None, jso
 		data: Form data
 		json_data: JSON data
 		retry_on_401: If True, automatically refresh token and retry on 401 error
+		idempotent: Whether the request is safe to resend after a gateway
+			error; defaults to True for everything but POST
 		
 	Returns:
 		Response object
 	"""
-	settings = frappe.get_doc("Zoho Books Settings", "Zoho Books Settings")
+	method = method.upper()
+	if method not in _SUPPORTED_METHODS:
+		frappe.throw(_("Unsupported HTTP method: {0}").format(method))
 	
-	if not settings.access_token:
-		frappe.throw(_("Access token not available. Please complete OAuth setup first."))
+	settings = get_settings()
 	
 	# Get valid access token (will refresh if needed)
-	access_token = get_valid_access_token()
+	access_token = get_valid_access_token(settings)
 	if not access_token:
-		frappe.throw(_("Failed to get valid access token. Please refresh manually or complete OAuth setup."))
+		frappe.throw(_("Access token not available. Please complete OAuth setup first."))
 	
 	# Prepare headers
 	if headers is None:
@@ -129,42 +426,44 @@ def make_zoho_api_request(method, url, headers=None, params=None, data=None, jso
 	if "Authorization" not in headers:
 		headers["Authorization"] = f"Zoho-oauthtoken {access_token}"
 	
+	if json_data is not None:
+		data = encode_json_body(json_data, headers)
+		json_data = None
+	
+	if idempotent is None:
+		idempotent = method != "POST"
+	
+	cache = frappe.cache()
+	rate_prefix = _get_rate_window_prefix(settings)
+	
+	def send():
+		_wait_for_rate_slot(cache, rate_prefix)
+		return _session.request(method, url, headers=headers, params=params, data=data, json=json_data, timeout=_TIMEOUT)
+	
+	def _do():
+		return _retry(send, idempotent=idempotent)
+	
 	# Make the request
 	try:
-		if method.upper() == "GET":
-			response = requests.get(url, headers=headers, params=params)
-		elif method.upper() == "POST":
-			response = requests.post(url, headers=headers, params=params, data=data, json=json_data)
-		elif method.upper() == "PUT":
-			response = requests.put(url, headers=headers, params=params, data=data, json=json_data)
-		elif method.upper() == "DELETE":
-			response = requests.delete(url, headers=headers, params=params)
-		else:
-			frappe.throw(_("Unsupported HTTP method: {0}").format(method))
+		response = _do()
 		
 		# If we get 401 and retry_on_401 is True, refresh token and retry once
 		if response.status_code == 401 and retry_on_401:
-			frappe.log_error(
+			log_zoho_error(
 				title="Zoho API 401 Error - Auto Refreshing Token",
 				message=f"Received 401 error, attempting to refresh token and retry. URL: {url}"
 			)
 			
-			# Refresh token
-			refresh_result = refresh_access_token_internal()
+			# The cached token was rejected, so drop it before refreshing
+			invalidate_token_cache()
+			refresh_result = refresh_access_token_internal(settings)
 			if refresh_result.get("status") == "success":
 				# Update access token in headers
 				new_access_token = refresh_result.get("access_token")
 				headers["Authorization"] = f"Zoho-oauthtoken {new_access_token}"
 				
 				# Retry the request
-				if method.upper() == "GET":
-					response = requests.get(url, headers=headers, params=params)
-				elif method.upper() == "POST":
-					response = requests.post(url, headers=headers, params=params, data=data, json=json_data)
-				elif method.upper() == "PUT":
-					response = requests.put(url, headers=headers, params=params, data=data, json=json_data)
-				elif method.upper() == "DELETE":
-					response = requests.delete(url, headers=headers, params=params)
+				response = _do()
 			else:
 				# Refresh failed, raise the original 401 error
 				response.raise_for_status()
@@ -172,12 +471,161 @@ def make_zoho_api_request(method, url, headers=None, params=None, data=None, jso
 		return response
 		
 	except requests.exceptions.RequestException as e:
-		frappe.log_error(
+		log_zoho_error(
 			title="Zoho API Request Error",
 			message=f"Request failed: {str(e)}\nURL: {url}\nMethod: {method}"
 		)
 		raise
 
+def make_zoho_api_requests(request_list, max_workers=4, return_exceptions=False):
+	"""
+	Make several Zoho API requests concurrently over the shared session.
+	
+	The access token is resolved once up front; worker threads only perform
+	the HTTP calls and never touch frappe.local. Any request answered with a
+	401 is retried sequentially through make_zoho_api_request, which takes
+	care of refreshing the token.
+	
+	Args:
+		request_list: List of dicts with the make_zoho_api_request arguments
+			(method, url, headers, params, data, json_data)
+		max_workers: Maximum number of requests in flight at once
+		return_exceptions: Put a request's RequestException in its slot
+			instead of raising it, so one failed request doesn't lose the
+			responses of the others
+		
+	Returns:
+		List of Response objects (or exceptions) in the same order as
+		request_list
+	"""
+	if not request_list:
+		return []
+	
+	settings = get_settings()
+	access_token = get_valid_access_token(settings)
+	if not access_token:
+		frappe.throw(_("Access token not available. Please complete OAuth setup first."))
+	
+	cache = frappe.cache()
+	rate_prefix = _get_rate_window_prefix(settings)
+	
+	def send(request):
+		headers = dict(request.get("headers") or {})
+		headers.setdefault("Authorization", f"Zoho-oauthtoken {access_token}")
+		data = request.get("data")
+		if request.get("json_data") is not None:
+			data = encode_json_body(request["json_data"], headers)
+		
+		def send_once():
+			_wait_for_rate_slot(cache, rate_prefix)
+			return _session.request(
+				request["method"].upper(),
+				request["url"],
+				headers=headers,
+				params=request.get("params"),
+				data=data,
+				timeout=_TIMEOUT
+			)
+		
+		try:
+			return _retry(send_once, idempotent=request["method"].upper() != "POST")
+		except requests.exceptions.RequestException as e:
+			if not return_exceptions:
+				raise
+			return e
+	
+	with ThreadPoolExecutor(max_workers=min(max_workers, len(request_list))) as executor:
+		responses = list(executor.map(send, request_list))
+	
+	for index, response in enumerate(responses):
+		if getattr(response, "status_code", None) == 401:
+			request = request_list[index]
+			try:
+				responses[index] = make_zoho_api_request(
+					request["method"],
+					request["url"],
+					headers=dict(request.get("headers") or {}),
+					params=request.get("params"),
+					data=request.get("data"),
+					json_data=request.get("json_data")
+				)
+			except requests.exceptions.RequestException as e:
+				if not return_exceptions:
+					raise
+				responses[index] = e
+	
+	return responses
+
+
+def iter_zoho_pages(url, key, organization_id, params=None, per_page=MAX_PER_PAGE, total_pages=0):
+	"""
+	Yield the records under key from each page of a Zoho list endpoint, in
+	page order
+	
+	Pages are requested PAGE_FETCH_WORKERS at a time over the shared session
+	until Zoho reports there are no more pages (or total_pages is reached),
+	dropping to one at a time when close to the rate limit.
+	
+	Args:
+		url: Zoho list endpoint, e.g. the contacts or items URL
+		key: Response key holding the records, e.g. "contacts" or "items"
+		organization_id: Zoho organization ID
+		params: Extra query parameters sent with every page
+	"""
+	headers = {
+		"X-com-zoho-books-organizationid": str(organization_id)
+	}
+	
+	per_page = min(cint(per_page) or MAX_PER_PAGE, MAX_PER_PAGE)
+	page = 1
+	workers = PAGE_FETCH_WORKERS
+	has_more_page = True
+	
+	try:
+		while has_more_page and (not total_pages or page <= total_pages):
+			last_page = page + workers - 1
+			if total_pages:
+				last_page = min(last_page, total_pages)
+			
+			responses = make_zoho_api_requests([
+				{
+					"method": "GET",
+					"url": url,
+					"headers": headers,
+					"params": {**(params or {}), "page": p, "per_page": per_page}
+				}
+				for p in range(page, last_page + 1)
+			], max_workers=workers)
+			
+			for response in responses:
+				response.raise_for_status()
+				page_data = parse_zoho_response(response)
+				yield page_data.get(key, [])
+				
+				has_more_page = page_data.get("page_context", {}).get("has_more_page", False)
+				if not has_more_page:
+					break
+			
+			page = last_page + 1
+			
+			# Drop to one page at a time when close to Zoho's rate limit
+			remaining = min(cint(r.headers.get("X-Rate-Limit-Remaining", PAGE_FETCH_WORKERS * 2)) for r in responses)
+			workers = PAGE_FETCH_WORKERS if remaining >= PAGE_FETCH_WORKERS * 2 else 1
+		
+	except requests.exceptions.HTTPError as e:
+		error_message = describe_http_error(e)
+		log_zoho_error(
+			title="Zoho Integration Issue",
+			message=f"HTTP Error getting {key} from Zoho: {error_message}\nURL: {url}\nPage: {page}"
+		)
+		frappe.throw(_("Failed to get {0} from Zoho Books: {1}").format(key, error_message))
+	except requests.exceptions.RequestException as e:
+		log_zoho_error(
+			title="Zoho Integration Issue",
+			message=f"Request Error getting {key} from Zoho: {str(e)}"
+		)
+		frappe.throw(_("Failed to get {0} from Zoho Books").format(key))
+
 @frappe.whitelist()
 def refresh_access_token():
 	"""
@@ -186,15 +634,45 @@ def refresh_access_token():
 	return refresh_access_token_internal()
 
 
+def proactive_refresh():
+	"""
+	Scheduled job that refreshes the access token before it expires,
+	so API calls always find a warm token cache
+	"""
+	settings = get_settings()
+	
+	if not settings.enabled or not settings.refresh_token:
+		return
+	
+	refresh_access_token_internal(settings)
+
+
+@frappe.whitelist()
+def enqueue_access_token_refresh():
+	"""
+	Refresh the access token in a background job instead of blocking the web worker
+	"""
+	frappe.only_for("System Manager")
+	
+	frappe.enqueue(
+		"zoho_integration.auth.refresh_access_token_internal",
+		queue="short",
+		job_id="zoho_access_token_refresh",
+		deduplicate=True
+	)
+	
+	return {
+		"status": "queued",
+		"message": "Access token refresh queued"
+	}
+
+
 @frappe.whitelist()
 def test_connection():
 	"""
 	Test the Zoho Books API connection with automatic token refresh
 	"""
-	settings = frappe.get_doc("Zoho Books Settings", "Zoho Books Settings")
-	
-	if not settings.access_token:
-		frappe.throw(_("Access token not available. Please complete OAuth setup first."))
+	settings = get_settings()
 	
 	url = "https://www.zohoapis.com/books/v3/organizations"
 	
@@ -202,10 +680,11 @@ def test_connection():
 		response = make_zoho_api_request("GET", url)
 		response.raise_for_status()
 		
-		organizations = response.json().get("organizations", [])
+		organizations = parse_zoho_response(response).get("organizations", [])
 		
 		if organizations:
 			if not settings.organization_id and len(organizations) > 0:
+				settings = frappe.get_doc("Zoho Books Settings", "Zoho Books Settings")
 				settings.organization_id = organizations[0].get("organization_id")
 				settings.save()
 				frappe.db.commit()
@@ -217,7 +696,7 @@ def test_connection():
 		}
 		
 	except requests.exceptions.RequestException as e:
-		frappe.log_error(
+		log_zoho_error(
 			title="Zoho Integration Issue",
 			message=f"API connection test failed: {str(e)}"
 		)
@@ -228,9 +707,7 @@ def get_authorization_url():
 	"""
 	Generate the authorization URL for Zoho Books OAuth
 	"""
-	settings = frappe.get_doc(
-		"Zoho Books Settings", "Zoho Books Settings",
-	)
+	settings = get_settings()
 	
 	if not settings.client_id:
 		frappe.throw(_("Client ID is not configured"))
@@ -246,7 +723,7 @@ def get_authorization_url():
 		"access_type": "offline"
 	}
 	
-	auth_url = f"https://accounts.zoho.com/oauth/v2/auth?scope={params['scope']}&client_id={params['client_id']}&response_type={params['response_type']}&redirect_uri={params['redirect_uri']}&access_type={params['access_type']}"
+	auth_url = "https://accounts.zoho.com/oauth/v2/auth?" + urlencode(params, quote_via=quote)
 	
 	return {
 		"authorization_url": auth_url,
@@ -264,38 +741,30 @@ def callback(code=None, error=None):
 	if not code:
 		frappe.throw(_("Authorization code not received"))
 	
-	frappe.log_error(
-		title="Zoho Integration Issue",
-		message=f"OAuth callback received - code: {code}"
-	)
-	
-	settings = frappe.get_doc(
-		"Zoho Books Settings", "Zoho Books Settings",
-	)
+	settings = frappe.get_doc("Zoho Books Settings", "Zoho Books Settings")
 
 	if not settings.client_id or not settings.client_secret:
 		frappe.throw(_("Client ID and Client Secret are not configured"))
 	
 	client_secret = settings.get_password("client_secret")
 	
-	frappe.log_error(
-		title="Zoho Integration Issue",
-		message=f"OAuth settings - client_id: {settings.client_id}, redirect_url: {settings.redirect_url}"
-	)
 	token_data = exchange_code_for_token(code, settings.client_id, client_secret, settings.redirect_url)
 	
 	if token_data:
-		settings.access_token = token_data.get("access_token")
-		settings.refresh_token = token_data.get("refresh_token")
+		access_token = token_data.get("access_token")
+		refresh_token = token_data.get("refresh_token")
+		settings.access_token = access_token
+		settings.refresh_token = refresh_token
 		settings.save()
 		
 		frappe.db.commit()
+		_set_cached_token(access_token, token_data.get("expires_in", 3600))
 		
 		return {
 			"status": "success",
 			"message": "OAuth setup completed successfully",
-			"access_token": token_data.get("access_token"),
-			"refresh_token": token_data.get("refresh_token")
+			"access_token": access_token,
+			"refresh_token": refresh_token
 		}
 	else:
 		frappe.throw(_("Failed to exchange authorization code for access token"))
@@ -314,31 +783,31 @@ def exchange_code_for_token(code, client_id, client_secret, redirect_uri):
 	}
 	
 	try:
-		response = requests.post(url, data=data)
-		frappe.log_error(
-			title="Zoho Integration Issue",
-			message=f"Token exchange response status: {response.status_code}"
-		)
-		frappe.log_error(
-			title="Zoho Integration Issue",
-			message=f"Token exchange response text: {response.text}"
-		)
+		# Authorization codes are single use, so only retry if Zoho never saw it
+		response = _retry(lambda: _session.post(url, data=data, timeout=_TIMEOUT), idempotent=False)
+		# Never log the response body here, it carries the OAuth tokens
+		log_zoho_debug(f"Token exchange response status: {response.status_code}")
 		
-		response.raise_for_status()
+		if response.status_code >= 400:
+			log_zoho_error(
+				title="Zoho Integration Issue",
+				message=f"Token exchange failed with HTTP {response.status_code}"
+			)
+			return None
 		
 		token_data = response.json()
 		
 		if "access_token" in token_data:
 			return token_data
 		else:
-			frappe.log_error(
+			log_zoho_error(
 				title="Zoho Integration Issue",
 				message=f"Token exchange failed: {token_data}"
 			)
 			return None
 			
 	except requests.exceptions.RequestException as e:
-		frappe.log_error(
+		log_zoho_error(
 			title="Zoho Integration Issue",
 			message=f"Token exchange request failed: {str(e)}"
 		)
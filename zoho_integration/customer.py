@@ -5,65 +5,94 @@ import frappe
 import requests
 import json
 from frappe import _
-from zoho_integration.auth import make_zoho_api_request, get_valid_access_token
+from frappe.utils import cint, cstr, sbool
+from zoho_integration.auth import make_zoho_api_request, make_zoho_api_requests, get_valid_access_token, get_settings, log_zoho_debug, parse_zoho_response, describe_http_error, iter_zoho_pages, MAX_PER_PAGE, PAGE_FETCH_WORKERS
 
 
-@frappe.whitelist()
-def get_zoho_customers_simple(organization_id=None, page=1, per_page=200):
-	"""
-	Simple version to get customers from Zoho Invoice without complex filtering
+CONTACTS_URL = "https://www.zohoapis.com/books/v3/contacts"
+
+# Only fetch customer-type contacts
+CUSTOMER_PAGE_PARAMS = {"contact_type": "customer"}
+
+# Customer field, Zoho contact key and default for the fields copied as-is
+CUSTOMER_FIELD_MAP = (
+	("customer_name", "contact_name", None),
+	("default_currency", "currency_code", "AED"),  # Fetch from Zoho, default to AED (UAE Dirham)
+	("zoho_contact_id", "contact_id", None),  # Reference document from Zoho
+	("zoho_contact_name", "contact_name", None),
+	("zoho_contact_type", "contact_type", None),
+	("zoho_company_name", "company_name", ""),
+	("zoho_first_name", "first_name", ""),
+	("zoho_last_name", "last_name", ""),
+	("zoho_email", "email", ""),
+	("zoho_phone", "phone", ""),
+	("zoho_mobile", "mobile", ""),
+	("zoho_fax", "fax", ""),
+	("zoho_website", "website", ""),
+	("zoho_billing_address", "billing_address", ""),
+	("zoho_shipping_address", "shipping_address", ""),
+	("zoho_payment_terms", "payment_terms", 0),
+	("zoho_payment_terms_label", "payment_terms_label", ""),
+	("zoho_currency_id", "currency_id", ""),
+	("zoho_currency_code", "currency_code", ""),
+	("zoho_currency_symbol", "currency_symbol", ""),
+	("zoho_currency_format", "currency_format", ""),
+	("zoho_price_precision", "price_precision", 2),
+	("zoho_outstanding_receivable_amount", "outstanding_receivable_amount", 0),
+	("zoho_outstanding_payable_amount", "outstanding_payable_amount", 0),
+	("zoho_unused_credits_receivable_amount", "unused_credits_receivable_amount", 0),
+	("zoho_unused_credits_payable_amount", "unused_credits_payable_amount", 0),
+)
+
+# Customer fields whose change needs a full save through the controller;
+# default_currency is validated against the customer's existing transactions
+CUSTOMER_CORE_FIELDS = ("customer_name", "customer_type", "customer_group", "territory", "default_currency")
+
+
+def get_organization_id(organization_id=None):
 	"""
-	settings = frappe.get_doc("Zoho Books Settings", "Zoho Books Settings")
-	
-	if not settings.access_token:
-		frappe.throw(_("Access token not available. Please complete OAuth setup first."))
+	Resolve the Zoho organization ID, defaulting to the one in settings.
 	
-	# Use organization_id from settings if not provided
-	if not organization_id:
-		organization_id = settings.organization_id
+	Settings come from the per-request cache in auth, so paginated calls
+	don't reload the document; the access token is resolved (and cached)
+	by make_zoho_api_request itself.
+	"""
+	organization_id = organization_id or get_settings().organization_id
 	
 	if not organization_id:
 		frappe.throw(_("Organization ID not configured"))
 	
-	url = "https://www.zohoapis.com/books/v3/contacts"
+	return organization_id
+
+
+def fetch_customers_page(organization_id, page=1, per_page=200):
+	"""
+	Fetch one page of contacts from Zoho Books
+	
+	Returns the decoded response, whose "contacts" and "page_context" keys
+	the callers read. Shared by the whitelisted list endpoints and the sync
+	so each page costs exactly one GET.
+	"""
 	headers = {
 		"X-com-zoho-books-organizationid": str(organization_id)
 	}
 	
 	params = {
 		"page": page,
-		"per_page": per_page,
+		"per_page": min(cint(per_page) or MAX_PER_PAGE, MAX_PER_PAGE),
 		"contact_type": "customer"  # Only fetch customer-type contacts
 	}
 	
 	try:
-		response = make_zoho_api_request("GET", url, headers=headers, params=params)
+		response = make_zoho_api_request("GET", CONTACTS_URL, headers=headers, params=params)
 		response.raise_for_status()
-		
-		customers_data = response.json()
-		all_contacts = customers_data.get("contacts", [])
-		
-		# API already filters by contact_type="customer", but double-check to ensure only customers are returned
-		# Use contact_id as the reference document from Zoho
-		all_customers = []
-		for contact in all_contacts:
-			# Ensure contact_type is customer and has a valid contact_id (reference document)
-			if contact.get("contact_type") == "customer" and contact.get("contact_id"):
-				all_customers.append(contact)
-		
-		return {
-			"status": "success",
-			"message": f"Customers retrieved successfully. Found {len(all_customers)} customers",
-			"customers": all_customers,
-			"page_context": customers_data.get("page_context", {}),
-			"total_customers": len(all_customers)
-		}
+		return parse_zoho_response(response)
 		
 	except requests.exceptions.HTTPError as e:
-		error_message = f"HTTP {e.response.status_code}: {e.response.text}"
+		error_message = describe_http_error(e)
 		frappe.log_error(
 			title="Zoho Integration Issue",
-			message=f"HTTP Error getting customers from Zoho: {error_message}\nURL: {url}\nParams: {params}"
+			message=f"HTTP Error getting customers from Zoho: {error_message}\nURL: {CONTACTS_URL}\nParams: {params}"
 		)
 		frappe.throw(_("Failed to get customers from Zoho Books: {0}").format(error_message))
 	except requests.exceptions.RequestException as e:
@@ -74,6 +103,37 @@ def get_zoho_customers_simple(organization_id=None, page=1, per_page=200):
 		frappe.throw(_("Failed to get customers from Zoho Books"))
 
 
+def extract_customers(contacts):
+	"""
+	Return the customer contacts from one page of Zoho contacts
+	"""
+	# API already filters by contact_type="customer", but double-check to ensure only customers are returned
+	# Use contact_id as the reference document from Zoho
+	return [
+		contact for contact in contacts
+		if contact.get("contact_type") == "customer" and contact.get("contact_id")
+	]
+
+
+@frappe.whitelist()
+def get_zoho_customers_simple(organization_id=None, page=1, per_page=200):
+	"""
+	Simple version to get customers from Zoho Invoice without complex filtering
+	"""
+	organization_id = get_organization_id(organization_id)
+	
+	customers_data = fetch_customers_page(organization_id, page, per_page)
+	all_customers = extract_customers(customers_data.get("contacts", []))
+	
+	return {
+		"status": "success",
+		"message": f"Customers retrieved successfully. Found {len(all_customers)} customers",
+		"customers": all_customers,
+		"page_context": customers_data.get("page_context", {}),
+		"total_customers": len(all_customers)
+	}
+
+
 @frappe.whitelist()
 def get_zoho_customers(organization_id=None, page=1, per_page=200, sync_from_date=None, only_new=False):
 	"""
@@ -86,76 +146,30 @@ def get_zoho_customers(organization_id=None, page=1, per_page=200, sync_from_dat
 		sync_from_date: Date to filter customers from (YYYY-MM-DD format)
 		only_new: If True, only fetch customers that don't exist in ERPNext yet
 	"""
-	settings = frappe.get_doc("Zoho Books Settings", "Zoho Books Settings")
-	
-	if not settings.access_token:
-		frappe.throw(_("Access token not available. Please complete OAuth setup first."))
-	
-	# Use organization_id from settings if not provided
-	if not organization_id:
-		organization_id = settings.organization_id
+	organization_id = get_organization_id(organization_id)
 	
-	if not organization_id:
-		frappe.throw(_("Organization ID not configured"))
+	customers_data = fetch_customers_page(organization_id, page, per_page)
+	all_customers = extract_customers(customers_data.get("contacts", []))
 	
-	url = "https://www.zohoapis.com/books/v3/contacts"
-	headers = {
-		"X-com-zoho-books-organizationid": str(organization_id)
-	}
+	# Filter out customers that already exist in ERPNext if only_new is True
+	# Use zoho_contact_id (reference document) to check for existing customers
+	if only_new:
+		zoho_contact_ids = [customer["contact_id"] for customer in all_customers]
+		existing_ids = set(frappe.get_all(
+			"Customer",
+			filters={"zoho_contact_id": ["in", zoho_contact_ids]},
+			pluck="zoho_contact_id"
+		)) if zoho_contact_ids else set()
+		all_customers = [customer for customer in all_customers if customer["contact_id"] not in existing_ids]
 	
-	params = {
-		"page": page,
-		"per_page": per_page,
-		"contact_type": "customer"  # Only fetch customer-type contacts
+	return {
+		"status": "success",
+		"message": f"Customers retrieved successfully. Found {len(all_customers)} customers",
+		"customers": all_customers,
+		"page_context": customers_data.get("page_context", {}),
+		"total_customers": len(all_customers),
+		"only_new_filter": only_new
 	}
-	
-	try:
-		response = make_zoho_api_request("GET", url, headers=headers, params=params)
-		response.raise_for_status()
-		
-		customers_data = response.json()
-		all_contacts = customers_data.get("contacts", [])
-		
-		# API already filters by contact_type="customer", but double-check to ensure only customers are returned
-		# Use contact_id as the reference document from Zoho
-		all_customers = []
-		for contact in all_contacts:
-			# Ensure contact_type is customer and has a valid contact_id (reference document)
-			if contact.get("contact_type") == "customer" and contact.get("contact_id"):
-				all_customers.append(contact)
-		
-		# Filter out customers that already exist in ERPNext if only_new is True
-		# Use zoho_contact_id (reference document) to check for existing customers
-		if only_new:
-			new_customers = []
-			for customer in all_customers:
-				zoho_contact_id = customer.get("contact_id")  # Reference document from Zoho
-				if zoho_contact_id and not frappe.db.exists("Customer", {"zoho_contact_id": zoho_contact_id}):
-					new_customers.append(customer)
-			all_customers = new_customers
-		
-		return {
-			"status": "success",
-			"message": f"Customers retrieved successfully. Found {len(all_customers)} customers",
-			"customers": all_customers,
-			"page_context": customers_data.get("page_context", {}),
-			"total_customers": len(all_customers),
-			"only_new_filter": only_new
-		}
-		
-	except requests.exceptions.HTTPError as e:
-		error_message = f"HTTP {e.response.status_code}: {e.response.text}"
-		frappe.log_error(
-			title="Zoho Integration Issue",
-			message=f"HTTP Error getting customers from Zoho: {error_message}\nURL: {url}\nParams: {params}"
-		)
-		frappe.throw(_("Failed to get customers from Zoho Books: {0}").format(error_message))
-	except requests.exceptions.RequestException as e:
-		frappe.log_error(
-			title="Zoho Integration Issue",
-			message=f"Request Error getting customers from Zoho: {str(e)}"
-		)
-		frappe.throw(_("Failed to get customers from Zoho Books"))
 
 
 @frappe.whitelist()
@@ -170,17 +184,8 @@ def sync_customers_from_zoho_to_erpnext(organization_id=None, page=1, per_page=N
 		sync_from_date: Date to filter customers from (YYYY-MM-DD format)
 		only_new: If True, only sync customers that don't exist in ERPNext yet
 	"""
-	settings = frappe.get_doc("Zoho Books Settings", "Zoho Books Settings")
-	
-	if not settings.access_token:
-		frappe.throw(_("Access token not available. Please complete OAuth setup first."))
-	
-	# Use organization_id from settings if not provided
-	if not organization_id:
-		organization_id = settings.organization_id
-	
-	if not organization_id:
-		frappe.throw(_("Organization ID not configured"))
+	settings = get_settings()
+	organization_id = get_organization_id(organization_id)
 	
 	# Use settings for pagination and date filtering
 	if per_page is None:
@@ -190,178 +195,405 @@ def sync_customers_from_zoho_to_erpnext(organization_id=None, page=1, per_page=N
 		sync_from_date = settings.sync_from_date
 	
 	# Get customers from Zoho Books
-	zoho_customers_response = get_zoho_customers_simple(organization_id, page, per_page)
-	zoho_customers = zoho_customers_response.get("customers", [])
+	zoho_customers = extract_customers(fetch_customers_page(organization_id, page, per_page).get("contacts", []))
+	
+	return sync_customer_batch(zoho_customers, only_new)
+
+
+@frappe.whitelist()
+def get_all_zoho_customers(organization_id=None, per_page=200):
+	"""
+	Get every customer from Zoho Books, fetching pages concurrently
+	"""
+	organization_id = get_organization_id(organization_id)
+	
+	all_customers = []
+	for contacts in iter_zoho_pages(CONTACTS_URL, "contacts", organization_id, CUSTOMER_PAGE_PARAMS, cint(per_page)):
+		all_customers.extend(extract_customers(contacts))
+	
+	return {
+		"status": "success",
+		"message": f"Customers retrieved successfully. Found {len(all_customers)} customers",
+		"customers": all_customers,
+		"total_customers": len(all_customers)
+	}
+
+
+@frappe.whitelist()
+def sync_all_customers(organization_id=None, per_page=None, total_pages=None, only_new=True):
+	"""
+	Sync every page of customers from Zoho Books to ERPNext
+	
+	Pages come from iter_zoho_pages and are written one at a time.
+	
+	Args:
+		organization_id: Zoho organization ID
+		per_page: Number of customers per page
+		total_pages: Stop after this many pages, if given
+		only_new: If True, only sync customers that don't exist in ERPNext yet
+	"""
+	organization_id = get_organization_id(organization_id)
+	per_page = cint(per_page) or cint(get_settings().customers_per_page) or 50
+	only_new = sbool(only_new)
+	
+	totals = {"synced_count": 0, "updated_count": 0, "unchanged_count": 0, "error_count": 0, "total_fetched_from_zoho": 0}
+	
+	# Every Zoho ID already in ERPNext, loaded once so each page's only_new
+	# filter is an in-memory lookup
+	known_zoho_ids = None
+	if only_new:
+		known_zoho_ids = set(frappe.get_all(
+			"Customer",
+			filters={"zoho_contact_id": ["is", "set"]},
+			pluck="zoho_contact_id"
+		))
+	
+	for contacts in iter_zoho_pages(CONTACTS_URL, "contacts", organization_id, CUSTOMER_PAGE_PARAMS, per_page, cint(total_pages)):
+		result = sync_customer_batch(extract_customers(contacts), only_new, known_zoho_ids)
+		for key in totals:
+			totals[key] += result[key]
+		
+		# One commit per page keeps finished pages if a later one fails and
+		# stops a long sync from holding row locks for its whole run
+		frappe.db.commit()
+	
+	return {
+		"status": "success",
+		"message": f"Customers sync completed. Created: {totals['synced_count']}, Updated: {totals['updated_count']}, Errors: {totals['error_count']}",
+		**totals
+	}
+
+
+
+@frappe.whitelist()
+def enqueue_customer_sync(organization_id=None, per_page=None, only_new=True):
+	"""
+	Queue a full customer sync as a background job and return straight away
+	
+	The result is sent to the calling user as a zoho_customer_sync realtime
+	event once the job finishes.
+	"""
+	job = frappe.enqueue(
+		"zoho_integration.customer.sync_customers_job",
+		queue="long",
+		timeout=3600,
+		job_id="zoho_customer_sync",
+		deduplicate=True,
+		organization_id=organization_id,
+		per_page=per_page,
+		only_new=only_new,
+		user=frappe.session.user
+	)
 	
+	if not job:
+		return {"status": "queued", "message": _("A customer sync is already running")}
+	
+	return {"status": "queued", "message": _("Customer sync queued"), "job_id": job.id}
+
+
+def sync_customers_job(organization_id=None, per_page=None, only_new=True, user=None):
+	"""
+	Background job queued by enqueue_customer_sync
+	
+	The user is told about failures too, then the error is raised again so
+	the job is still recorded as failed.
+	"""
+	try:
+		result = sync_all_customers(organization_id, per_page, only_new=only_new)
+	except Exception as e:
+		if user:
+			frappe.publish_realtime(
+				"zoho_customer_sync",
+				{"status": "error", "message": cstr(e) or _("Customer sync failed")},
+				user=user
+			)
+		raise
+	
+	if user:
+		frappe.publish_realtime("zoho_customer_sync", result, user=user)
+
+def sync_customer_batch(zoho_customers, only_new=True, known_zoho_ids=None):
+	"""
+	Create or update ERPNext customers for one page of Zoho contacts
+	
+	known_zoho_ids is an optional set of every zoho_contact_id already in
+	ERPNext; with only_new it drops known contacts without a query.
+	"""
 	# Log how many customers were fetched from Zoho
 	total_fetched = len(zoho_customers)
-	frappe.log_error(
-		title="Zoho Customer Sync Debug",
-		message=f"Fetched {total_fetched} customers from Zoho (contact_type=customer)"
-	)
+	log_zoho_debug(f"Fetched {total_fetched} customers from Zoho (contact_type=customer)")
+	
+	existing_count = 0
+	if only_new and known_zoho_ids is not None:
+		zoho_customers = [c for c in zoho_customers if c.get("contact_id") not in known_zoho_ids]
+		existing_count = total_fetched - len(zoho_customers)
+	
+	if not zoho_customers:
+		return {
+			"status": "success",
+			"message": "Customers sync completed. Created: 0, Updated: 0, Errors: 0",
+			"synced_count": 0,
+			"updated_count": 0,
+			"unchanged_count": 0,
+			"error_count": 0,
+			"total_fetched_from_zoho": total_fetched,
+			"existing_customers_skipped": existing_count,
+			"customers_processed": 0,
+			"created_names": [],
+			"updated_names": [],
+			"skipped": [],
+			"errors": []
+		}
+	
+	# Look up every matching ERPNext customer for this page in one go
+	# instead of querying per contact inside the loops below
+	existing_by_zoho_id, existing_by_name = get_existing_customers(zoho_customers)
 	
 	# Filter out customers that already exist in ERPNext if only_new is True
 	# Use zoho_contact_id (reference document) to check for existing customers
-	existing_count = 0
+	# extract_customers already dropped contacts without a contact_id
 	if only_new:
-		new_customers = []
-		for customer in zoho_customers:
-			zoho_contact_id = customer.get("contact_id")  # Reference document from Zoho
-			if zoho_contact_id:
-				if frappe.db.exists("Customer", {"zoho_contact_id": zoho_contact_id}):
-					existing_count += 1
-				else:
-					new_customers.append(customer)
-			else:
-				# Log customers without contact_id
-				frappe.log_error(
-					title="Zoho Customer Sync Warning",
-					message=f"Customer {customer.get('contact_name')} has no contact_id (reference document), skipping"
-				)
+		new_customers = [c for c in zoho_customers if c.get("contact_id") not in existing_by_zoho_id]
+		existing_count += len(zoho_customers) - len(new_customers)
 		zoho_customers = new_customers
-		frappe.log_error(
-			title="Zoho Customer Sync Debug",
-			message=f"After filtering: {len(zoho_customers)} new customers, {existing_count} already exist"
-		)
+		log_zoho_debug(f"After filtering: {len(zoho_customers)} new customers, {existing_count} already exist")
 	else:
 		# When only_new=False, count existing customers for reporting
-		for customer in zoho_customers:
-			zoho_contact_id = customer.get("contact_id")  # Reference document from Zoho
-			if zoho_contact_id and frappe.db.exists("Customer", {"zoho_contact_id": zoho_contact_id}):
-				existing_count += 1
-		frappe.log_error(
-			title="Zoho Customer Sync Debug",
-			message=f"Processing all customers: {len(zoho_customers)} total, {existing_count} already exist (will be updated)"
-		)
+		existing_count += sum(1 for c in zoho_customers if c.get("contact_id") in existing_by_zoho_id)
+		log_zoho_debug(f"Processing all customers: {len(zoho_customers)} total, {existing_count} already exist (will be updated)")
 	
 	synced_count = 0
 	updated_count = 0
+	unchanged_count = 0
 	error_count = 0
 	
+	# First pass: map every contact and decide whether it updates an existing
+	# customer or creates a new one, so the writes below run as two batches
+	customers_to_update = []
+	customers_to_create = []
+	created_names = []
+	updated_names = []
+	skipped = []
+	errors = []
+	pending_zoho_ids = set()
+	pending_names = set()
+	
+	now = frappe.utils.now()
+	
 	for zoho_customer in zoho_customers:
-		try:
-			# Map Zoho customer to ERPNext customer format
-			erpnext_customer_data = {
-				"doctype": "Customer",
-				"customer_name": zoho_customer.get("contact_name"),
-				"customer_type": "Individual" if zoho_customer.get("contact_type") == "customer" else "Company",
-				"customer_group": "All Customer Groups",
-				"territory": "All Territories",
-				"disabled": 0 if zoho_customer.get("status") == "active" else 1,
-				"is_internal_customer": 0,
-				"default_currency": zoho_customer.get("currency_code", "AED"),  # Fetch from Zoho, default to AED (UAE Dirham)
-				"default_price_list": "Standard Selling",
-				"zoho_contact_id": zoho_customer.get("contact_id"),  # Reference document from Zoho
-				"zoho_contact_name": zoho_customer.get("contact_name"),
-				"zoho_contact_type": zoho_customer.get("contact_type"),
-				"zoho_company_name": zoho_customer.get("company_name", ""),
-				"zoho_first_name": zoho_customer.get("first_name", ""),
-				"zoho_last_name": zoho_customer.get("last_name", ""),
-				"zoho_email": zoho_customer.get("email", ""),
-				"zoho_phone": zoho_customer.get("phone", ""),
-				"zoho_mobile": zoho_customer.get("mobile", ""),
-				"zoho_fax": zoho_customer.get("fax", ""),
-				"zoho_website": zoho_customer.get("website", ""),
-				"zoho_billing_address": zoho_customer.get("billing_address", ""),
-				"zoho_shipping_address": zoho_customer.get("shipping_address", ""),
-				"zoho_payment_terms": zoho_customer.get("payment_terms", 0),
-				"zoho_payment_terms_label": zoho_customer.get("payment_terms_label", ""),
-				"zoho_currency_id": zoho_customer.get("currency_id", ""),
-				"zoho_currency_code": zoho_customer.get("currency_code", ""),
-				"zoho_currency_symbol": zoho_customer.get("currency_symbol", ""),
-				"zoho_currency_format": zoho_customer.get("currency_format", ""),
-				"zoho_price_precision": zoho_customer.get("price_precision", 2),
-				"zoho_outstanding_receivable_amount": zoho_customer.get("outstanding_receivable_amount", 0),
-				"zoho_outstanding_payable_amount": zoho_customer.get("outstanding_payable_amount", 0),
-				"zoho_unused_credits_receivable_amount": zoho_customer.get("unused_credits_receivable_amount", 0),
-				"zoho_unused_credits_payable_amount": zoho_customer.get("unused_credits_payable_amount", 0),
-				"zoho_last_synced": frappe.utils.now()
-			}
-			
-			# Check if customer already exists in ERPNext by zoho_contact_id (reference document from Zoho)
-			existing_customer_by_zoho_id = None
-			zoho_contact_id = zoho_customer.get("contact_id")  # Reference document from Zoho
+		# Map Zoho customer to ERPNext customer format
+		erpnext_customer_data = map_zoho_customer(zoho_customer, now)
+		
+		# Read the keys once from the mapped row
+		zoho_contact_id = erpnext_customer_data["zoho_contact_id"]  # Reference document from Zoho
+		contact_name = erpnext_customer_data["customer_name"]
+		
+		# Match by zoho_contact_id first, then by customer name to prevent duplicates
+		existing_customer = existing_by_zoho_id.get(zoho_contact_id) or existing_by_name.get(contact_name)
+		
+		if existing_customer:
+			customers_to_update.append((existing_customer, erpnext_customer_data, zoho_customer))
+		elif (zoho_contact_id and zoho_contact_id in pending_zoho_ids) or (contact_name and contact_name in pending_names):
+			# Same contact repeated within this page
+			skipped.append(contact_name)
+		else:
 			if zoho_contact_id:
-				existing_customer_by_zoho_id = frappe.db.exists("Customer", {"zoho_contact_id": zoho_contact_id})
-			
-			# Also check by customer name to prevent duplicates
-			existing_customer_by_name = None
-			if zoho_customer.get("contact_name"):
-				existing_customer_by_name = frappe.db.exists("Customer", {"customer_name": zoho_customer.get("contact_name")})
-			
-			# Use whichever existing customer we found
-			existing_customer = existing_customer_by_zoho_id or existing_customer_by_name
-			
-			if existing_customer:
-				# Update existing customer
+				pending_zoho_ids.add(zoho_contact_id)
+			if contact_name:
+				pending_names.add(contact_name)
+			customers_to_create.append((erpnext_customer_data, zoho_customer))
+	
+	total_to_process = len(customers_to_update) + len(customers_to_create)
+	
+	# Current values of the customers being updated, so unchanged ones can
+	# be skipped and Zoho-only changes can bypass the full document save
+	current_values = {}
+	fast_update_fields = []
+	if customers_to_update and get_settings().fast_customer_update:
+		customer_meta = frappe.get_meta("Customer")
+		fast_update_fields = [
+			fieldname for fieldname in customers_to_update[0][1]
+			if (fieldname.startswith("zoho_") or fieldname == "disabled")
+			and fieldname != "zoho_last_synced"
+			and customer_meta.has_field(fieldname)
+		]
+		current_values = {
+			row.name: row for row in frappe.get_all(
+				"Customer",
+				filters={"name": ["in", [row[0] for row in customers_to_update]]},
+				fields=["name", *CUSTOMER_CORE_FIELDS, *fast_update_fields]
+			)
+		}
+	
+	# Second pass: update existing customers
+	for existing_customer, erpnext_customer_data, zoho_customer in customers_to_update:
+		try:
+			current = current_values.get(existing_customer)
+			if current and all(current.get(f) == erpnext_customer_data.get(f) for f in CUSTOMER_CORE_FIELDS):
+				# Blank and zero values compare equal, the DB returns NULL for both
+				changes = {
+					f: erpnext_customer_data.get(f) for f in fast_update_fields
+					if (current.get(f) or None) != (erpnext_customer_data.get(f) or None)
+				}
+				if changes:
+					# Only Zoho-side fields differ, write them in one UPDATE
+					changes["zoho_last_synced"] = now
+					frappe.db.set_value("Customer", existing_customer, changes, update_modified=False)
+					updated_count += 1
+					updated_names.append(existing_customer)
+				else:
+					unchanged_count += 1
+			else:
 				customer_doc = frappe.get_doc("Customer", existing_customer)
 				customer_doc.update(erpnext_customer_data)
 				customer_doc.save()
 				updated_count += 1
-				frappe.msgprint(f"Updated customer: {zoho_customer.get('contact_name')}")
-			else:
-				# Double-check before creating to prevent race conditions
-				# Use zoho_contact_id (reference document) to verify customer doesn't exist
-				zoho_contact_id = zoho_customer.get("contact_id")  # Reference document from Zoho
-				if zoho_contact_id and frappe.db.exists("Customer", {"zoho_contact_id": zoho_contact_id}):
-					frappe.msgprint(f"Customer {zoho_customer.get('contact_name')} already exists, skipping creation")
-					continue
-				
-				if zoho_customer.get("contact_name") and frappe.db.exists("Customer", {"customer_name": zoho_customer.get("contact_name")}):
-					frappe.msgprint(f"Customer {zoho_customer.get('contact_name')} already exists, skipping creation")
-					continue
-				
-				# Create new customer
+				updated_names.append(existing_customer)
+		except Exception as e:
+			errors.append(customer_sync_error(zoho_customer, e))
+			error_count += 1
+		
+		publish_sync_progress(synced_count + updated_count + unchanged_count + error_count, total_to_process)
+	
+	# Third pass: create new customers. These still go through the Customer
+	# controller (naming, defaults, hooks), so a failing row is isolated
+	for erpnext_customer_data, zoho_customer in customers_to_create:
+		try:
+			try:
 				customer_doc = frappe.get_doc(erpnext_customer_data)
 				customer_doc.insert()
 				synced_count += 1
-				frappe.msgprint(f"Created customer: {zoho_customer.get('contact_name')}")
-			
+				created_names.append(customer_doc.name)
+			except (frappe.DuplicateEntryError, frappe.UniqueValidationError):
+				# zoho_contact_id is unique, so another sync created this
+				# customer after the lookup above; update it instead. A clash
+				# on that column is a UniqueValidationError, not a name clash
+				zoho_contact_id = erpnext_customer_data["zoho_contact_id"]
+				existing_customer = zoho_contact_id and frappe.db.get_value(
+					"Customer", {"zoho_contact_id": zoho_contact_id}
+				)
+				if not existing_customer:
+					raise
+				
+				customer_doc = frappe.get_doc("Customer", existing_customer)
+				customer_doc.update(erpnext_customer_data)
+				customer_doc.save()
+				updated_count += 1
+				updated_names.append(customer_doc.name)
 		except Exception as e:
-			error_message = str(e)
-			
-			# Log detailed error information
-			frappe.log_error(
-				title="Zoho Integration Issue",
-				message=f"Failed to sync customer {zoho_customer.get('contact_name')} from Zoho: {error_message}\nCustomer data: {zoho_customer}"
-			)
-			
-			# Show user-friendly error message
-			if "required" in error_message.lower():
-				frappe.msgprint(f"Error with customer {zoho_customer.get('contact_name')}: Required field missing - {error_message}")
-			elif "duplicate" in error_message.lower():
-				frappe.msgprint(f"Error with customer {zoho_customer.get('contact_name')}: Duplicate customer - {error_message}")
-			else:
-				frappe.msgprint(f"Error with customer {zoho_customer.get('contact_name')}: {error_message}")
-			
+			errors.append(customer_sync_error(zoho_customer, e))
 			error_count += 1
+		
+		publish_sync_progress(synced_count + updated_count + unchanged_count + error_count, total_to_process)
+	
+	# One Error Log for the whole page rather than one per failed customer
+	if errors:
+		frappe.log_error(
+			title="Zoho Integration Issue",
+			message=f"Failed to sync {len(errors)} customers from Zoho:\n{json.dumps(errors, indent=1)}"
+		)
 	
 	return {
 		"status": "success",
 		"message": f"Customers sync completed. Created: {synced_count}, Updated: {updated_count}, Errors: {error_count}",
 		"synced_count": synced_count,
 		"updated_count": updated_count,
+		"unchanged_count": unchanged_count,
 		"error_count": error_count,
 		"total_fetched_from_zoho": total_fetched,
 		"existing_customers_skipped": existing_count if only_new else 0,
-		"customers_processed": len(zoho_customers) if not only_new else (total_fetched - existing_count)
+		"customers_processed": len(zoho_customers) if not only_new else (total_fetched - existing_count),
+		"created_names": created_names,
+		"updated_names": updated_names,
+		"skipped": skipped,
+		"errors": errors
 	}
 
 
+def publish_sync_progress(processed, total, doctype="Customer"):
+	"""
+	Push sync progress to the user's browser every 50 records
+	"""
+	if processed % 50 == 0 or processed == total:
+		frappe.publish_realtime(
+			"zoho_sync_progress",
+			{"doctype": doctype, "processed": processed, "total": total},
+			user=frappe.session.user
+		)
+
+
+def map_zoho_customer(zoho_customer, now):
+	"""
+	Map a Zoho contact to Customer field values, stamped with the sync time
+	"""
+	get = zoho_customer.get
+	
+	customer_data = {fieldname: get(zoho_key, default) for fieldname, zoho_key, default in CUSTOMER_FIELD_MAP}
+	customer_data.update({
+		"doctype": "Customer",
+		"customer_type": "Individual" if get("contact_type") == "customer" else "Company",
+		"customer_group": "All Customer Groups",
+		"territory": "All Territories",
+		"disabled": 0 if get("status") == "active" else 1,
+		"is_internal_customer": 0,
+		"default_price_list": "Standard Selling",
+		"zoho_last_synced": now
+	})
+	
+	return customer_data
+
+
+def customer_sync_error(zoho_customer, error):
+	"""
+	Summarise a customer that failed to sync, without the contact payload
+	"""
+	return {
+		"contact_id": zoho_customer.get("contact_id"),
+		"customer": zoho_customer.get("contact_name"),
+		"error": cstr(error)[:1000]
+	}
+
+
+def get_existing_customers(zoho_customers):
+	"""
+	Find the ERPNext customers matching a batch of Zoho contacts
+	
+	Args:
+		zoho_customers: List of Zoho contact dicts
+		
+	Returns:
+		Tuple of dicts mapping zoho_contact_id and customer_name to the Customer name
+	"""
+	zoho_contact_ids = [c.get("contact_id") for c in zoho_customers if c.get("contact_id")]
+	contact_names = [c.get("contact_name") for c in zoho_customers if c.get("contact_name")]
+	
+	existing_by_zoho_id = {}
+	if zoho_contact_ids:
+		for customer in frappe.get_all(
+			"Customer",
+			filters={"zoho_contact_id": ["in", zoho_contact_ids]},
+			fields=["name", "zoho_contact_id"]
+		):
+			existing_by_zoho_id[customer.zoho_contact_id] = customer.name
+	
+	existing_by_name = {}
+	if contact_names:
+		for customer in frappe.get_all(
+			"Customer",
+			filters={"customer_name": ["in", contact_names]},
+			fields=["name", "customer_name"]
+		):
+			existing_by_name[customer.customer_name] = customer.name
+	
+	return existing_by_zoho_id, existing_by_name
+
+
 @frappe.whitelist()
 def push_customer_to_zoho(customer_name):
 	"""
 	Push a customer from ERPNext to Zoho Books
 	"""
-	settings = frappe.get_doc("Zoho Books Settings", "Zoho Books Settings")
-	
-	if not settings.access_token:
-		frappe.throw(_("Access token not available. Please complete OAuth setup first."))
-	
-	organization_id = settings.organization_id
-	
-	if not organization_id:
-		frappe.throw(_("Organization ID not configured"))
+	organization_id = get_organization_id()
 	
 	# Get customer from ERPNext
 	customer = frappe.get_doc("Customer", customer_name)
@@ -374,7 +606,7 @@ def push_customer_to_zoho(customer_name):
 		action = "updated"
 	else:
 		# Create new contact
-		url = "https://www.zohoapis.com/books/v3/contacts"
+		url = CONTACTS_URL
 		method = "POST"
 		action = "created"
 	
@@ -383,37 +615,17 @@ def push_customer_to_zoho(customer_name):
 		"Content-Type": "application/json"
 	}
 	
-	# Prepare contact data
-	contact_data = {
-		"contact_name": customer.customer_name,
-		"contact_type": "customer",
-		"customer_sub_type": "business" if customer.customer_type == "Company" else "individual",
-		"currency_code": customer.default_currency or "AED"
-	}
-	
-	# Add optional fields if available
-	if customer.email_id:
-		contact_data["email"] = customer.email_id
-	if customer.mobile_no:
-		contact_data["mobile"] = customer.mobile_no
+	address = None
 	if customer.primary_address:
 		address = frappe.get_doc("Address", customer.primary_address)
-		if address:
-			billing_address = {
-				"address": address.address_line1 or "",
-				"street2": address.address_line2 or "",
-				"city": address.city or "",
-				"state": address.state or "",
-				"zip": address.pincode or "",
-				"country": address.country or ""
-			}
-			contact_data["billing_address"] = billing_address
+	
+	contact_data = build_contact_data(customer, address)
 	
 	try:
 		response = make_zoho_api_request(method, url, headers=headers, json_data=contact_data)
 		response.raise_for_status()
 		
-		contact_response = response.json()
+		contact_response = parse_zoho_response(response)
 		zoho_contact = contact_response.get("contact", {})
 		zoho_contact_id = zoho_contact.get("contact_id")
 		
@@ -434,41 +646,179 @@ def push_customer_to_zoho(customer_name):
 			frappe.throw(_("Failed to get contact ID from Zoho response"))
 	
 	except requests.exceptions.HTTPError as e:
-		error_message = f"HTTP {e.response.status_code}: {e.response.text}"
+		error_message = describe_http_error(e)
 		frappe.log_error(
 			title="Zoho Customer Push Failed",
-			message=f"Failed to push customer {customer_name} to Zoho: {error_message}"
+			message=f"Failed to push customer {customer_name} to Zoho: {error_message}",
+			reference_doctype="Customer",
+			reference_name=customer_name
 		)
 		frappe.throw(_(f"Failed to push customer to Zoho Books: {error_message}"))
 	except Exception as e:
 		frappe.log_error(
 			title="Zoho Customer Push Failed",
-			message=f"Error pushing customer {customer_name} to Zoho: {str(e)}"
+			message=f"Error pushing customer {customer_name} to Zoho: {str(e)}",
+			reference_doctype="Customer",
+			reference_name=customer_name
 		)
 		frappe.throw(_(f"Failed to push customer to Zoho Books: {str(e)}"))
 
 
-def push_customer_on_submit(doc, method):
+def build_contact_data(customer, address=None):
+	"""
+	Build the Zoho contact payload for a Customer doc or row
+	"""
+	contact_data = {
+		"contact_name": customer.customer_name,
+		"contact_type": "customer",
+		"customer_sub_type": "business" if customer.customer_type == "Company" else "individual",
+		"currency_code": customer.default_currency or "AED"
+	}
+	
+	# Add optional fields if available
+	if customer.email_id:
+		contact_data["email"] = customer.email_id
+	if customer.mobile_no:
+		contact_data["mobile"] = customer.mobile_no
+	if address:
+		contact_data["billing_address"] = {
+			"address": address.address_line1 or "",
+			"street2": address.address_line2 or "",
+			"city": address.city or "",
+			"state": address.state or "",
+			"zip": address.pincode or "",
+			"country": address.country or ""
+		}
+	
+	return contact_data
+
+
+@frappe.whitelist()
+def bulk_push_customers(names):
+	"""
+	Push several customers to Zoho Books concurrently
+	
+	Customers and their primary addresses are loaded in two queries and the
+	contacts are created/updated in parallel over the shared session.
+	
+	Args:
+		names: List (or JSON list) of Customer names
+	"""
+	names = frappe.parse_json(names) if isinstance(names, str) else names
+	if not names:
+		return {"status": "success", "message": "No customers to push", "pushed_count": 0, "error_count": 0, "errors": []}
+	
+	organization_id = get_organization_id()
+	
+	customers = frappe.get_all(
+		"Customer",
+		filters={"name": ["in", names]},
+		fields=[
+			"name", "customer_name", "customer_type", "default_currency",
+			"email_id", "mobile_no", "primary_address", "zoho_contact_id"
+		]
+	)
+	
+	address_names = [c.primary_address for c in customers if c.primary_address]
+	addresses = {
+		a.name: a for a in frappe.get_all(
+			"Address",
+			filters={"name": ["in", address_names]},
+			fields=["name", "address_line1", "address_line2", "city", "state", "pincode", "country"]
+		)
+	} if address_names else {}
+	
+	headers = {
+		"X-com-zoho-books-organizationid": str(organization_id)
+	}
+	
+	responses = make_zoho_api_requests([
+		{
+			"method": "PUT" if c.zoho_contact_id else "POST",
+			"url": f"{CONTACTS_URL}/{c.zoho_contact_id}" if c.zoho_contact_id else CONTACTS_URL,
+			"headers": headers,
+			"json_data": build_contact_data(c, addresses.get(c.primary_address))
+		}
+		for c in customers
+	], max_workers=PAGE_FETCH_WORKERS, return_exceptions=True)
+	
+	now = frappe.utils.now()
+	pushed_count = 0
+	errors = []
+	
+	# Contacts Zoho created are recorded even if other requests failed,
+	# so pushing again doesn't create them twice
+	for customer, response in zip(customers, responses):
+		try:
+			if isinstance(response, Exception):
+				raise response
+			response.raise_for_status()
+			zoho_contact = parse_zoho_response(response).get("contact", {})
+			if not zoho_contact.get("contact_id"):
+				frappe.throw(_("Failed to get contact ID from Zoho response"))
+			
+			frappe.db.set_value("Customer", customer.name, {
+				"zoho_contact_id": zoho_contact.get("contact_id"),
+				"zoho_contact_name": zoho_contact.get("contact_name"),
+				"zoho_last_synced": now
+			})
+			pushed_count += 1
+		except Exception as e:
+			errors.append({"customer": customer.name, "error": cstr(e)[:1000]})
+	
+	if errors:
+		frappe.log_error(
+			title="Zoho Customer Push Failed",
+			message=f"Failed to push {len(errors)} customers to Zoho:\n{json.dumps(errors, indent=1)}"
+		)
+	
+	return {
+		"status": "success",
+		"message": f"Customers pushed to Zoho. Pushed: {pushed_count}, Errors: {len(errors)}",
+		"pushed_count": pushed_count,
+		"error_count": len(errors),
+		"errors": errors
+	}
+
+
+def enqueue_customer_push(doc, method):
 	"""
 	Hook function to automatically push customer to Zoho when submitted/saved
+	
+	The push runs in a background job once the save has committed, so the
+	user never waits on Zoho and rolled-back customers are never pushed.
 	"""
 	try:
 		# Check if Zoho integration is enabled
-		settings = frappe.get_doc("Zoho Books Settings", "Zoho Books Settings")
+		settings = get_settings()
 		if settings.enabled and settings.auto_sync_customer:
 			# Only push if not already synced to Zoho
 			if not doc.zoho_contact_id:
-				result = push_customer_to_zoho(doc.name)
-				
-				if result.get("status") == "success":
-					frappe.msgprint(f"Customer synced to Zoho successfully: {result.get('zoho_contact_id')}", alert=True)
-				else:
-					frappe.log_error(
-						title="Zoho Customer Auto-Sync Failed",
-						message=f"Failed to auto-sync customer {doc.name} to Zoho: {result.get('message')}"
-					)
+				frappe.enqueue(
+					"zoho_integration.customer.push_customer_job",
+					queue="short",
+					job_id=f"zoho_push_customer::{doc.name}",
+					deduplicate=True,
+					enqueue_after_commit=True,
+					customer_name=doc.name
+				)
 	except Exception as e:
 		frappe.log_error(
 			title="Zoho Integration Hook Error",
-			message=f"Error in push_customer_on_submit hook: {str(e)}"
-		)
\ No newline at end of file
+			message=f"Error in enqueue_customer_push hook: {str(e)}"
+		)
+
+
+def push_customer_job(customer_name):
+	"""
+	Background job queued by enqueue_customer_push
+	"""
+	result = push_customer_to_zoho(customer_name)
+	
+	if result.get("status") != "success":
+		frappe.log_error(
+			title="Zoho Customer Auto-Sync Failed",
+			message=f"Failed to auto-sync customer {customer_name} to Zoho: {result.get('message')}",
+			reference_doctype="Customer",
+			reference_name=customer_name
+		)
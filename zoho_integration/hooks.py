@@ -142,13 +142,12 @@ doctype_js = {
 # Hook on document methods and events
 
 doc_events = {
+	# on_update also runs when a document is inserted
 	"Customer": {
-		"after_insert": "zoho_integration.customer.push_customer_on_submit",
-		"on_update": "zoho_integration.customer.push_customer_on_submit"
+		"on_update": "zoho_integration.customer.enqueue_customer_push"
 	},
 	"Item": {
-		"after_insert": "zoho_integration.item.push_item_on_submit",
-		"on_update": "zoho_integration.item.push_item_on_submit"
+		"on_update": "zoho_integration.item.enqueue_item_push"
 	},
 	"Sales Invoice": {
 		"on_submit": "zoho_integration.invoice.send_invoice_on_update"
@@ -176,6 +175,19 @@ doc_events = {
 # 	],
 # }
 
+scheduler_events = {
+	"cron": {
+		# Zoho access tokens expire after an hour, refresh well before that
+		"*/30 * * * *": [
+			"zoho_integration.auth.proactive_refresh"
+		],
+		# Invoices are queued on submit and sent to Zoho in batches
+		"* * * * *": [
+			"zoho_integration.invoice.sync_pending_zoho_invoices"
+		]
+	}
+}
+
 # Testing
 # -------
 
@@ -1,11 +1,58 @@
 # Copyright (c) 2025, itsyosefali and contributors
 # For license information, please see license.txt
 
+import hashlib
+
 import frappe
 import requests
-import json
 from frappe import _
-from zoho_integration.auth import make_zoho_api_request, get_valid_access_token
+from frappe.utils import add_to_date, cint, get_datetime, now_datetime
+from zoho_integration.auth import make_zoho_api_request, get_settings, get_zoho_logger, parse_zoho_response
+
+
+# Only the fields the Zoho payloads are built from
+INVOICE_FIELDS = (
+	"name", "customer", "posting_date", "due_date", "remarks", "discount_amount",
+	"total_taxes_and_charges", "paid_amount", "docstatus", "zoho_invoice_id"
+)
+INVOICE_ITEM_FIELDS = ("item_name", "description", "rate", "qty", "uom")
+INVOICE_PAYMENT_FIELDS = ("mode_of_payment", "reference_no")
+CUSTOMER_FIELDS = ("name", "customer_name", "customer_type", "email_id", "mobile_no", "zoho_contact_id")
+
+# ERPNext mode of payment keyword -> Zoho payment_mode, first match wins
+PAYMENT_MODE_KEYWORDS = (
+	("cash", "cash"),
+	("credit", "creditcard"),
+	("card", "creditcard"),
+	("bank", "banktransfer"),
+	("transfer", "banktransfer"),
+	("cheque", "bankremittance"),
+	("check", "bankremittance"),
+	("auto", "autotransaction")
+)
+
+# Zoho contact IDs resolved by name/email, kept for a day
+CONTACT_CACHE_TTL = 24 * 60 * 60
+
+# Invoices sent per scheduler run. Each one takes at most 5 Zoho calls:
+# contact search and create (skipped once the customer has a Zoho contact
+# ID), invoice create, a balance GET if the create response lacks one, and
+# the payment. 15 x 5 = 75 keeps even a worst-case run inside Zoho's 100
+# calls per minute with room for other traffic
+INVOICES_PER_RUN = 15
+
+# A Processing claim older than this belongs to a worker that died before
+# marking the invoice Synced or Failed, so the invoice may be claimed again
+CLAIM_TIMEOUT_MINUTES = 10
+
+
+def contact_cache_key(organization_id, customer_name, email=None):
+	"""
+	Redis key for the Zoho contact ID of a customer name and email within
+	one Zoho organization
+	"""
+	digest = hashlib.md5(f"{organization_id}|{customer_name}|{email or ''}".encode()).hexdigest()
+	return f"zoho_contact_map:{digest}"
 
 
 @frappe.whitelist()
@@ -13,16 +60,8 @@ def create_zoho_contact(customer_name, email=None, phone=None, mobile=None, comp
 	"""
 	Create a contact in Zoho Books/Invoice if it doesn't exist
 	"""
-	settings = frappe.get_doc("Zoho Books Settings", "Zoho Books Settings")
-	
-	if not settings.access_token:
-		frappe.log_error(
-			title="Zoho Integration Issue",
-			message="Access token not available for creating contact"
-		)
-		return None
-	
-	organization_id = settings.organization_id
+	# A missing access token surfaces from make_zoho_api_request below
+	organization_id = get_settings().organization_id
 	
 	if not organization_id:
 		frappe.log_error(
@@ -33,8 +72,7 @@ def create_zoho_contact(customer_name, email=None, phone=None, mobile=None, comp
 	
 	url = "https://www.zohoapis.com/books/v3/contacts"
 	headers = {
-		"X-com-zoho-books-organizationid": str(organization_id),
-		"Content-Type": "application/json"
+		"X-com-zoho-books-organizationid": str(organization_id)
 	}
 	
 	# Prepare contact data
@@ -59,13 +97,15 @@ def create_zoho_contact(customer_name, email=None, phone=None, mobile=None, comp
 		response = make_zoho_api_request("POST", url, headers=headers, json_data=contact_data)
 		
 		if response.status_code == 201:
-			contact_response = response.json()
+			contact_response = parse_zoho_response(response)
 			contact_id = contact_response.get("contact", {}).get("contact_id")
 			
-			frappe.log_error(
-				title="Zoho Contact Created",
-				message=f"Contact created successfully: {customer_name} (ID: {contact_id})"
-			)
+			if contact_id:
+				frappe.cache().set_value(
+					contact_cache_key(organization_id, customer_name, email), contact_id, expires_in_sec=CONTACT_CACHE_TTL
+				)
+			
+			get_zoho_logger().info(f"Contact created successfully: {customer_name} (ID: {contact_id})")
 			
 			return contact_id
 		else:
@@ -88,16 +128,17 @@ def find_zoho_contact_id(customer_name, email=None):
 	"""
 	Find existing contact ID in Zoho Books - only returns customer-type contacts
 	"""
-	settings = frappe.get_doc("Zoho Books Settings", "Zoho Books Settings")
-	
-	if not settings.access_token:
-		return None
-	
-	organization_id = settings.organization_id
+	organization_id = get_settings().organization_id
 	
 	if not organization_id:
 		return None
 	
+	# Repeat customers are answered from Redis without searching Zoho
+	cache_key = contact_cache_key(organization_id, customer_name, email)
+	contact_id = frappe.cache().get_value(cache_key)
+	if contact_id:
+		return contact_id
+	
 	url = "https://www.zohoapis.com/books/v3/contacts"
 	headers = {
 		"X-com-zoho-books-organizationid": str(organization_id)
@@ -113,20 +154,20 @@ def find_zoho_contact_id(customer_name, email=None):
 		response = make_zoho_api_request("GET", url, headers=headers, params=params)
 		
 		if response.status_code == 200:
-			contacts_data = response.json()
+			contacts_data = parse_zoho_response(response)
 			contacts = contacts_data.get("contacts", [])
 			
-			# Search for exact match by name or email, ensuring it's a customer
-			for contact in contacts:
-				# Double-check that contact_type is customer
-				if contact.get("contact_type") != "customer":
-					continue
-					
-				if (contact.get("contact_name") == customer_name or 
-					(email and contact.get("email") == email)):
-					return contact.get("contact_id")
+			# Exact match by name, then by email, ensuring it's a customer;
+			# built in reverse so the first contact Zoho returns wins
+			customers = [c for c in reversed(contacts) if c.get("contact_type") == "customer"]
+			by_name = {c.get("contact_name"): c.get("contact_id") for c in customers}
+			by_email = {c["email"]: c.get("contact_id") for c in customers if c.get("email")}
 			
-			return None
+			contact_id = by_name.get(customer_name) or (email and by_email.get(email)) or None
+			if contact_id:
+				frappe.cache().set_value(cache_key, contact_id, expires_in_sec=CONTACT_CACHE_TTL)
+			
+			return contact_id
 		else:
 			frappe.log_error(
 				title="Zoho Integration Issue",
@@ -147,15 +188,18 @@ def send_invoice_to_zoho(invoice_id):
 	"""
 	Send invoice from ERPNext to Zoho Books/Invoice
 	"""
+	if not _claim_invoice(invoice_id):
+		return {"status": "error", "message": _("Invoice {0} is already being sent or was sent to Zoho").format(invoice_id)}
+	
 	try:
-		# Get the invoice document
-		invoice_doc = frappe.get_doc("Sales Invoice", invoice_id)
+		# Get the invoice fields
+		invoice_doc = get_invoice_data(invoice_id)
 		
 		# Get customer details
-		customer_doc = frappe.get_doc("Customer", invoice_doc.customer)
+		customer_doc = frappe.db.get_value("Customer", invoice_doc.customer, CUSTOMER_FIELDS, as_dict=True)
 		
 		# Check if customer already has a Zoho contact ID
-		zoho_contact_id = getattr(customer_doc, 'zoho_contact_id', None)
+		zoho_contact_id = customer_doc.zoho_contact_id
 		
 		if not zoho_contact_id:
 			# Try to find existing contact in Zoho
@@ -164,25 +208,24 @@ def send_invoice_to_zoho(invoice_id):
 				customer_doc.email_id
 			)
 			
-			if zoho_contact_id:
-				# Update customer with found Zoho contact ID
-				customer_doc.db_set("zoho_contact_id", zoho_contact_id)
-				frappe.db.commit()
-		
-		if not zoho_contact_id:
-			# Create new contact in Zoho
-			zoho_contact_id = create_zoho_contact(
-				customer_name=customer_doc.customer_name,
-				email=customer_doc.email_id,
-				phone=customer_doc.mobile_no,
-				mobile=customer_doc.mobile_no,
-				company_name=customer_doc.customer_name if customer_doc.customer_type == "Company" else None
-			)
+			if not zoho_contact_id:
+				# Create new contact in Zoho
+				zoho_contact_id = create_zoho_contact(
+					customer_name=customer_doc.customer_name,
+					email=customer_doc.email_id,
+					phone=customer_doc.mobile_no,
+					mobile=customer_doc.mobile_no,
+					company_name=customer_doc.customer_name if customer_doc.customer_type == "Company" else None
+				)
 			
-			if zoho_contact_id:
-				# Update customer with new Zoho contact ID
-				customer_doc.db_set("zoho_contact_id", zoho_contact_id)
-				frappe.db.commit()
+			# Store the resolved ID so later invoices skip the Zoho lookup,
+			# unless another customer already owns it (zoho_contact_id is unique)
+			if zoho_contact_id and not frappe.db.exists(
+				"Customer", {"zoho_contact_id": zoho_contact_id, "name": ["!=", customer_doc.name]}
+			):
+				frappe.db.set_value(
+					"Customer", customer_doc.name, "zoho_contact_id", zoho_contact_id, update_modified=False
+				)
 		
 		if not zoho_contact_id:
 			frappe.log_error(
@@ -196,10 +239,7 @@ def send_invoice_to_zoho(invoice_id):
 		
 		if invoice_result.get("status") == "success":
 			# Update ERPNext invoice with Zoho invoice ID and sync status
-			invoice_doc.db_set("zoho_invoice_id", invoice_result.get("invoice_id"))
-			invoice_doc.db_set("zoho_invoice_number", invoice_result.get("invoice_number"))
-			invoice_doc.db_set("zoho_sync_status", "Synced")
-			frappe.db.commit()
+			_mark_synced(invoice_id, invoice_result.get("invoice_id"), invoice_result.get("invoice_number"))
 			
 			return {
 				"status": "success",
@@ -209,14 +249,12 @@ def send_invoice_to_zoho(invoice_id):
 			}
 		else:
 			# Set sync status to failed
-			invoice_doc.db_set("zoho_sync_status", "Failed")
-			frappe.db.commit()
+			_mark_failed(invoice_id)
 			return invoice_result
 			
 	except Exception as e:
 		# Set sync status to failed
-		invoice_doc.db_set("zoho_sync_status", "Failed")
-		frappe.db.commit()
+		_mark_failed(invoice_id)
 		
 		frappe.log_error(
 			title="Zoho Integration Issue",
@@ -225,14 +263,105 @@ def send_invoice_to_zoho(invoice_id):
 		return {"status": "error", "message": str(e)}
 
 
-def submit_zoho_invoice_for_approval(invoice_id, organization_id, access_token):
+def _claim_invoice(invoice_id):
+	"""
+	Mark the Sales Invoice as Processing unless it is already being sent
+	or was sent, so the scheduler and the Push button never send it twice
+	
+	The row is locked while it is checked, so of two concurrent callers
+	only the first one claims it. Claims older than CLAIM_TIMEOUT_MINUTES
+	are treated as abandoned.
+	"""
+	invoice = frappe.db.get_value(
+		"Sales Invoice", invoice_id, ["zoho_invoice_id", "zoho_sync_status", "zoho_claimed_at"],
+		as_dict=True, for_update=True
+	)
+	claim_active = (
+		invoice and invoice.zoho_sync_status == "Processing" and invoice.zoho_claimed_at
+		and get_datetime(invoice.zoho_claimed_at) > _claim_cutoff()
+	)
+	if not invoice or invoice.zoho_invoice_id or claim_active:
+		# Release the row lock
+		frappe.db.commit()
+		return False
+	
+	frappe.db.set_value(
+		"Sales Invoice",
+		invoice_id,
+		{"zoho_sync_status": "Processing", "zoho_claimed_at": now_datetime()},
+		update_modified=False
+	)
+	frappe.db.commit()
+	return True
+
+
+def _claim_cutoff():
+	"""
+	Claims made before this time are abandoned
+	"""
+	return add_to_date(now_datetime(), minutes=-CLAIM_TIMEOUT_MINUTES)
+
+
+def _mark_synced(invoice_id, zoho_invoice_id, zoho_invoice_number):
+	"""
+	Record the Zoho invoice on the Sales Invoice in a single UPDATE
+	"""
+	frappe.db.set_value(
+		"Sales Invoice",
+		invoice_id,
+		{
+			"zoho_invoice_id": zoho_invoice_id,
+			"zoho_invoice_number": zoho_invoice_number,
+			"zoho_sync_status": "Synced"
+		},
+		update_modified=False
+	)
+	frappe.db.commit()
+
+
+def _mark_failed(invoice_id):
+	"""
+	Flag the Sales Invoice as failed to sync
+	"""
+	frappe.db.set_value("Sales Invoice", invoice_id, "zoho_sync_status", "Failed", update_modified=False)
+	frappe.db.commit()
+
+
+def get_invoice_data(invoice_id):
+	"""
+	Load the Sales Invoice fields, items and payments used to build the Zoho
+	payloads, without hydrating the full document
+	"""
+	invoice = frappe.db.get_value("Sales Invoice", invoice_id, INVOICE_FIELDS, as_dict=True)
+	if not invoice:
+		frappe.throw(_("Sales Invoice {0} not found").format(invoice_id))
+	
+	invoice.items = frappe.get_all(
+		"Sales Invoice Item",
+		filters={"parent": invoice_id, "parenttype": "Sales Invoice"},
+		fields=INVOICE_ITEM_FIELDS,
+		order_by="idx asc"
+	)
+	invoice.payments = frappe.get_all(
+		"Sales Invoice Payment",
+		filters={"parent": invoice_id, "parenttype": "Sales Invoice"},
+		fields=INVOICE_PAYMENT_FIELDS,
+		order_by="idx asc"
+	)
+	
+	# Zoho wants ISO dates; the invoice and payment payloads both use this
+	invoice.posting_date_str = invoice.posting_date.strftime("%Y-%m-%d")
+	
+	return invoice
+
+
+def submit_zoho_invoice_for_approval(invoice_id, organization_id):
 	"""
 	Submit invoice for approval in Zoho Books
 	"""
 	url = f"https://www.zohoapis.com/books/v3/invoices/{invoice_id}/submit"
 	headers = {
-		"X-com-zoho-books-organizationid": str(organization_id),
-		"Content-Type": "application/json"
+		"X-com-zoho-books-organizationid": str(organization_id)
 	}
 	
 	params = {
@@ -243,12 +372,9 @@ def submit_zoho_invoice_for_approval(invoice_id, organization_id, access_token):
 		response = make_zoho_api_request("POST", url, headers=headers, params=params)
 		
 		if response.status_code == 200:
-			submit_response = response.json()
+			submit_response = parse_zoho_response(response)
 			if submit_response.get("code") == 0:
-				frappe.log_error(
-					title="Zoho Invoice Submitted",
-					message=f"Invoice submitted for approval successfully: {invoice_id}"
-				)
+				get_zoho_logger().info(f"Invoice submitted for approval successfully: {invoice_id}")
 				return {"status": "success", "message": "Invoice submitted for approval"}
 			else:
 				error_msg = f"Failed to submit invoice: {submit_response.get('message', 'Unknown error')}"
@@ -274,7 +400,7 @@ def submit_zoho_invoice_for_approval(invoice_id, organization_id, access_token):
 		return {"status": "error", "message": error_msg}
 
 
-def get_zoho_invoice_balance(invoice_id, organization_id, access_token):
+def get_zoho_invoice_balance(invoice_id, organization_id):
 	"""
 	Get invoice balance from Zoho Books
 	"""
@@ -291,7 +417,7 @@ def get_zoho_invoice_balance(invoice_id, organization_id, access_token):
 		response = make_zoho_api_request("GET", url, headers=headers, params=params)
 		
 		if response.status_code == 200:
-			invoice_response = response.json()
+			invoice_response = parse_zoho_response(response)
 			invoice_data = invoice_response.get("invoice", {})
 			balance = float(invoice_data.get("balance", 0))
 			return balance
@@ -310,43 +436,41 @@ def get_zoho_invoice_balance(invoice_id, organization_id, access_token):
 		return None
 
 
-def create_zoho_payment(invoice_doc, zoho_invoice_id, customer_id, organization_id, access_token):
+def create_zoho_payment(invoice_doc, zoho_invoice_id, customer_id, organization_id, zoho_balance=None):
 	"""
 	Create a payment in Zoho Books for the invoice
+	
+	Pass zoho_balance when it is already known (e.g. from the create
+	response) to skip fetching the invoice again.
 	"""
 	# Check if invoice has payment information
 	if not invoice_doc.paid_amount or invoice_doc.paid_amount <= 0:
-		frappe.log_error(
-			title="Zoho Payment Skipped",
-			message=f"No payment amount found for invoice: {invoice_doc.name}"
-		)
+		get_zoho_logger().info(f"Payment skipped, no payment amount found for invoice: {invoice_doc.name}")
 		return {"status": "skipped", "message": "No payment amount found"}
 	
 	# Get invoice balance from Zoho to ensure we don't exceed it
-	zoho_balance = get_zoho_invoice_balance(zoho_invoice_id, organization_id, access_token)
+	if zoho_balance is None:
+		zoho_balance = get_zoho_invoice_balance(zoho_invoice_id, organization_id)
 	
 	# Use the minimum of paid_amount and invoice balance
 	if zoho_balance is not None:
 		payment_amount = min(float(invoice_doc.paid_amount), float(zoho_balance))
 		if payment_amount <= 0:
-			frappe.log_error(
-				title="Zoho Payment Skipped",
-				message=f"Invoice balance is zero or negative for invoice: {invoice_doc.name}, Balance: {zoho_balance}"
+			get_zoho_logger().info(
+				f"Payment skipped, invoice balance is zero or negative for invoice: {invoice_doc.name}, Balance: {zoho_balance}"
 			)
 			return {"status": "skipped", "message": f"Invoice balance is {zoho_balance}, cannot create payment"}
 		
 		# Log if payment amount was adjusted due to balance constraint
 		if payment_amount < float(invoice_doc.paid_amount):
-			frappe.log_error(
-				title="Zoho Payment Amount Adjusted",
-				message=f"Payment amount adjusted from {invoice_doc.paid_amount} to {payment_amount} due to invoice balance ({zoho_balance}) for invoice: {invoice_doc.name}"
+			get_zoho_logger().warning(
+				f"Payment amount adjusted from {invoice_doc.paid_amount} to {payment_amount} due to invoice balance ({zoho_balance}) for invoice: {invoice_doc.name}"
 			)
 	else:
 		# If we can't get balance, use paid_amount but log a warning
 		payment_amount = float(invoice_doc.paid_amount)
-		frappe.log_error(
-			title="Zoho Payment Warning",
-			message=f"Could not fetch invoice balance from Zoho, using paid_amount: {payment_amount} for invoice: {invoice_doc.name}"
+		get_zoho_logger().warning(
+			f"Could not fetch invoice balance from Zoho, using paid_amount: {payment_amount} for invoice: {invoice_doc.name}"
 		)
 	
 	# Get payment mode from invoice payments table or default to cash
@@ -359,33 +483,14 @@ def create_zoho_payment(invoice_doc, zoho_invoice_id, customer_id, organization_
 		if payment_entry.mode_of_payment:
 			# Map ERPNext payment modes to Zoho payment modes
 			mode_name = payment_entry.mode_of_payment.lower()
-			if "cash" in mode_name:
-				payment_mode = "cash"
-			elif "credit" in mode_name or "card" in mode_name:
-				payment_mode = "creditcard"
-			elif "bank" in mode_name or "transfer" in mode_name:
-				payment_mode = "banktransfer"
-			elif "cheque" in mode_name or "check" in mode_name:
-				payment_mode = "bankremittance"
-			elif "auto" in mode_name:
-				payment_mode = "autotransaction"
-			else:
-				# Default mapping for common names
-				mode_mapping = {
-					"cash": "cash",
-					"bank": "banktransfer",
-					"credit card": "creditcard",
-					"cheque": "bankremittance",
-					"bank transfer": "banktransfer",
-					"bank remittance": "bankremittance",
-					"auto transaction": "autotransaction"
-				}
-				payment_mode = mode_mapping.get(mode_name, "cash")
+			payment_mode = next(
+				(zoho_mode for keyword, zoho_mode in PAYMENT_MODE_KEYWORDS if keyword in mode_name),
+				"cash"
+			)
 	
 	url = "https://www.zohoapis.com/books/v3/customerpayments"
 	headers = {
-		"X-com-zoho-books-organizationid": str(organization_id),
-		"Content-Type": "application/json"
+		"X-com-zoho-books-organizationid": str(organization_id)
 	}
 	
 	params = {
@@ -397,7 +502,7 @@ def create_zoho_payment(invoice_doc, zoho_invoice_id, customer_id, organization_
 		"customer_id": customer_id,
 		"payment_mode": payment_mode,
 		"amount": payment_amount,
-		"date": invoice_doc.posting_date.strftime("%Y-%m-%d"),
+		"date": invoice_doc.posting_date_str,
 		"invoices": [
 			{
 				"invoice_id": str(zoho_invoice_id),
@@ -420,7 +525,7 @@ def create_zoho_payment(invoice_doc, zoho_invoice_id, customer_id, organization_
 		response = make_zoho_api_request("POST", url, headers=headers, params=params, json_data=payment_data)
 		
 		if response.status_code == 201:
-			payment_response = response.json()
+			payment_response = parse_zoho_response(response)
 			zoho_payment_id = payment_response.get("customerpayment", {}).get("payment_id")
 			
 			return {
@@ -429,7 +534,7 @@ def create_zoho_payment(invoice_doc, zoho_invoice_id, customer_id, organization_
 				"payment_id": zoho_payment_id
 			}
 		else:
-			error_response = response.json() if response.text else {}
+			error_response = parse_zoho_response(response) if response.text else {}
 			error_code = error_response.get("code", "Unknown")
 			error_message = error_response.get("message", response.text)
 			error_msg = f"Failed to create payment: {response.status_code} - Code: {error_code}, Message: {error_message}"
@@ -445,14 +550,11 @@ def create_zoho_invoice(invoice_doc, customer_id):
 	"""
 	Create invoice in Zoho Books/Invoice
 	"""
-	settings = frappe.get_doc("Zoho Books Settings", "Zoho Books Settings")
-	
-	organization_id = settings.organization_id
+	organization_id = get_settings().organization_id
 	
 	url = "https://www.zohoapis.com/books/v3/invoices"
 	headers = {
-		"X-com-zoho-books-organizationid": str(organization_id),
-		"Content-Type": "application/json"
+		"X-com-zoho-books-organizationid": str(organization_id)
 	}
 	
 	# Add query parameter to ignore auto number generation
@@ -461,22 +563,22 @@ def create_zoho_invoice(invoice_doc, customer_id):
 	}
 	
 	# Prepare line items
-	line_items = []
-	for item in invoice_doc.items:
-		line_item = {
+	line_items = [
+		{
 			"item_id": "",  # You might want to map ERPNext items to Zoho items
-			"name": item.item_name,
-			"description": item.description or item.item_name,
-			"rate": float(item.rate),
-			"quantity": float(item.qty),
-			"unit": item.uom or "Nos"
+			"name": item["item_name"],
+			"description": item["description"] or item["item_name"],
+			"rate": float(item["rate"]),
+			"quantity": float(item["qty"]),
+			"unit": item["uom"] or "Nos"
 		}
-		line_items.append(line_item)
+		for item in invoice_doc.items
+	]
 	
 	# Prepare invoice data
 	invoice_data = {
 		"customer_id": customer_id,
-		"date": invoice_doc.posting_date.strftime("%Y-%m-%d"),
+		"date": invoice_doc.posting_date_str,
 		"invoice_number": invoice_doc.name,
 		"reference_number": invoice_doc.name,
 		"line_items": line_items,
@@ -500,39 +602,38 @@ def create_zoho_invoice(invoice_doc, customer_id):
 		invoice_data["tax_total"] = float(invoice_doc.total_taxes_and_charges)
 	
 	try:
+		# Not retried on gateway errors: Zoho may already have created the
+		# invoice, and a resend would only fail on the duplicate number
 		response = make_zoho_api_request("POST", url, headers=headers, params=params, json_data=invoice_data)
 		
 		if response.status_code == 201:
-			invoice_response = response.json()
+			invoice_response = parse_zoho_response(response)
 			zoho_invoice_id = invoice_response.get("invoice", {}).get("invoice_id")
 			zoho_invoice_number = invoice_response.get("invoice", {}).get("invoice_number")
+			# The created invoice already carries its balance
+			zoho_balance = invoice_response.get("invoice", {}).get("balance")
 			
-			frappe.log_error(
-				title="Zoho Invoice Created",
-				message=f"Invoice created successfully: {invoice_doc.name} -> Zoho #{zoho_invoice_number} (ID: {zoho_invoice_id})"
+			get_zoho_logger().info(
+				f"Invoice created successfully: {invoice_doc.name} -> Zoho #{zoho_invoice_number} (ID: {zoho_invoice_id})"
 			)
 			
 			# Create payment for the invoice if payment amount exists
-			# Get access token for payment creation
-			access_token = get_valid_access_token()
 			payment_result = create_zoho_payment(
 				invoice_doc, 
 				zoho_invoice_id, 
 				customer_id, 
 				organization_id, 
-				access_token
+				zoho_balance=zoho_balance
 			)
 			
 			# Log payment creation result
 			if payment_result.get("status") == "success":
-				frappe.log_error(
-					title="Zoho Payment Created Successfully",
-					message=f"Payment created successfully for invoice: {invoice_doc.name} -> Zoho Payment ID: {payment_result.get('payment_id')}, Amount: {invoice_doc.paid_amount}"
+				get_zoho_logger().info(
+					f"Payment created successfully for invoice: {invoice_doc.name} -> Zoho Payment ID: {payment_result.get('payment_id')}, Amount: {invoice_doc.paid_amount}"
 				)
 			elif payment_result.get("status") == "skipped":
-				frappe.log_error(
-					title="Zoho Payment Skipped",
-					message=f"Payment skipped for invoice: {invoice_doc.name} - {payment_result.get('message')}"
+				get_zoho_logger().info(
+					f"Payment skipped for invoice: {invoice_doc.name} - {payment_result.get('message')}"
 				)
 			else:
 				frappe.log_error(
@@ -565,25 +666,71 @@ def create_zoho_invoice(invoice_doc, customer_id):
 def send_invoice_on_update(doc, method):
 	"""
 	Hook function to automatically send invoice to Zoho when submitted
+	
+	The invoice is only marked Queued; sync_pending_zoho_invoices picks it
+	up within a minute, so the user never waits on Zoho round-trips.
 	"""
+	# Only send if not already sent to Zoho and invoice is submitted;
+	# checked first as it needs no settings lookup at all
+	if doc.zoho_invoice_id or doc.docstatus != 1:
+		return
+	
 	try:
 		# Check if Zoho integration is enabled
-		settings = frappe.get_doc("Zoho Books Settings", "Zoho Books Settings")
+		settings = get_settings()
 		if settings.enabled and settings.auto_sync_invoice:
-			# Only send if not already sent to Zoho and invoice is submitted
-			if not doc.zoho_invoice_id and doc.docstatus == 1:
-				# Set initial sync status
-				doc.db_set("zoho_sync_status", "Not Synced")
-				
-				result = send_invoice_to_zoho(doc.name)
-				
-				if result.get("status") == "success":
-					frappe.msgprint(f"Invoice sent to Zoho successfully: {result.get('message')}", alert=True)
-				else:
-					frappe.msgprint(f"Failed to send invoice to Zoho: {result.get('message')}", alert=True, indicator='red')
+			# Set initial sync status
+			doc.db_set("zoho_sync_status", "Queued", update_modified=False)
 					
 	except Exception as e:
 		frappe.log_error(
 			title="Zoho Integration Hook Error",
 			message=f"Error in send_invoice_on_update hook: {str(e)}"
-		)
\ No newline at end of file
+		)
+
+
+@frappe.whitelist()
+def sync_pending_zoho_invoices(limit=INVOICES_PER_RUN):
+	"""
+	Scheduled job that sends queued invoices to Zoho in one worker, so the
+	settings, token, session and contact cache are shared across the batch
+	"""
+	frappe.only_for("System Manager")
+	
+	settings = get_settings()
+	if not settings.enabled or not settings.auto_sync_invoice:
+		return
+	
+	# Queued invoices, plus any whose Processing claim was abandoned
+	pending = frappe.get_all(
+		"Sales Invoice",
+		filters={"zoho_sync_status": ["in", ["Queued", "Processing"]], "docstatus": 1},
+		or_filters=[
+			["zoho_sync_status", "=", "Queued"],
+			["zoho_claimed_at", "<", _claim_cutoff()]
+		],
+		fields=["name", "owner"],
+		order_by="creation asc",
+		limit_page_length=min(cint(limit) or INVOICES_PER_RUN, INVOICES_PER_RUN)
+	)
+	
+	for invoice in pending:
+		send_invoice_job(invoice.name, user=invoice.owner)
+
+
+def send_invoice_job(invoice_id, user=None):
+	"""
+	Send one invoice to Zoho and report the result to user in realtime
+	"""
+	result = send_invoice_to_zoho(invoice_id)
+	
+	if user:
+		frappe.publish_realtime(
+			"zoho_invoice_sync",
+			{
+				"invoice_id": invoice_id,
+				"status": result.get("status"),
+				"message": result.get("message")
+			},
+			user=user
+		)
@@ -5,7 +5,36 @@ import frappe
 import requests
 import json
 from frappe import _
-from zoho_integration.auth import make_zoho_api_request, get_valid_access_token
+from frappe.utils import cint, cstr, flt
+from zoho_integration.auth import make_zoho_api_request, make_zoho_api_requests, get_settings, describe_http_error, parse_zoho_response, iter_zoho_pages, PAGE_FETCH_WORKERS
+from zoho_integration.customer import get_organization_id, publish_sync_progress
+
+
+ITEMS_URL = "https://www.zohoapis.com/books/v3/items"
+
+# Zoho inventory_valuation_method keyword -> ERPNext valuation method,
+# first match wins; anything else is FIFO
+VALUATION_METHOD_KEYWORDS = (
+	("LIFO", "LIFO"),
+	("FIFO", "FIFO"),
+	("AVERAGE", "Moving Average"),
+	("WEIGHTED", "Moving Average")
+)
+
+# Item columns besides the zoho_* ones that need no Item controller logic,
+# so changes to them alone can be written without a full save
+FAST_UPDATE_FIELDS = ("disabled", "standard_rate", "valuation_rate")
+
+# Warnings sent back with a full item sync; the complete list goes to the
+# Error Log when there are more
+MAX_SYNC_MESSAGES = 100
+
+# Item Defaults row given to items created from Zoho
+DEFAULT_COMPANY = "Big Man Collections"
+DEFAULT_WAREHOUSE = "Stores - BMC"
+
+# Rows per Stock Reconciliation / Stock Entry posted by post_stock_updates
+STOCK_ROWS_PER_DOC = 500
 
 
 @frappe.whitelist()
@@ -13,17 +42,8 @@ def get_zoho_items(organization_id=None, page=1, per_page=200, sync_from_date=No
 	"""
 	Get items from Zoho Books
 	"""
-	settings = frappe.get_doc("Zoho Books Settings", "Zoho Books Settings")
-	
-	if not settings.access_token:
-		frappe.throw(_("Access token not available. Please complete OAuth setup first."))
-	
 	# Use organization_id from settings if not provided
-	if not organization_id:
-		organization_id = settings.organization_id
-	
-	if not organization_id:
-		frappe.throw(_("Organization ID not configured"))
+	organization_id = get_organization_id(organization_id)
 	
 	url = "https://www.zohoapis.com/books/v3/items"
 	headers = {
@@ -43,7 +63,7 @@ def get_zoho_items(organization_id=None, page=1, per_page=200, sync_from_date=No
 		response = make_zoho_api_request("GET", url, headers=headers, params=params)
 		response.raise_for_status()
 		
-		items_data = response.json()
+		items_data = parse_zoho_response(response)
 		
 		return {
 			"status": "success",
@@ -53,7 +73,7 @@ def get_zoho_items(organization_id=None, page=1, per_page=200, sync_from_date=No
 		}
 		
 	except requests.exceptions.HTTPError as e:
-		error_message = f"HTTP {e.response.status_code}: {e.response.text}"
+		error_message = describe_http_error(e)
 		frappe.log_error(
 			title="Zoho Integration Issue",
 			message=f"HTTP Error getting items from Zoho: {error_message}\nURL: {url}\nParams: {params}"
@@ -72,20 +92,10 @@ def sync_items_from_zoho_to_erpnext(organization_id=None, page=1, per_page=None,
 	"""
 	Sync items from Zoho Books to ERPNext
 	"""
-	settings = frappe.get_doc("Zoho Books Settings", "Zoho Books Settings")
-	
-	if not settings.access_token:
-		frappe.throw(_("Access token not available. Please complete OAuth setup first."))
-	
-	# Get the decrypted access token
-	access_token = settings.get_password("access_token")
+	settings = get_settings()
 	
 	# Use organization_id from settings if not provided
-	if not organization_id:
-		organization_id = settings.organization_id
-	
-	if not organization_id:
-		frappe.throw(_("Organization ID not configured"))
+	organization_id = get_organization_id(organization_id)
 	
 	# Use settings for pagination and date filtering
 	if per_page is None:
@@ -98,33 +108,170 @@ def sync_items_from_zoho_to_erpnext(organization_id=None, page=1, per_page=None,
 	zoho_items_response = get_zoho_items(organization_id, page, per_page, sync_from_date)
 	zoho_items = zoho_items_response.get("items", [])
 	
+	return sync_item_batch(zoho_items)
+
+
+@frappe.whitelist()
+def sync_all_items(organization_id=None, per_page=None, total_pages=None):
+	"""
+	Sync every page of items from Zoho Books to ERPNext
+	
+	Pages come from iter_zoho_pages and are written one at a time.
+	
+	Args:
+		organization_id: Zoho organization ID
+		per_page: Number of items per page
+		total_pages: Stop after this many pages, if given
+	"""
+	organization_id = get_organization_id(organization_id)
+	per_page = cint(per_page) or cint(get_settings().items_per_page) or 50
+	
+	totals = {"synced_count": 0, "updated_count": 0, "unchanged_count": 0, "error_count": 0}
+	
+	# Warnings and errors of every page; msgprint reaches no one when this
+	# runs as a background job, so they are returned with the totals
+	messages = []
+	
+	for zoho_items in iter_zoho_pages(ITEMS_URL, "items", organization_id, per_page=per_page, total_pages=cint(total_pages)):
+		result = sync_item_batch(zoho_items)
+		for key in totals:
+			totals[key] += result[key]
+		messages.extend(result["messages"])
+		
+		# One commit per page keeps finished pages if a later one fails
+		frappe.db.commit()
+	
+	if len(messages) > MAX_SYNC_MESSAGES:
+		frappe.log_error(
+			title="Zoho Item Sync Messages",
+			message="\n".join(messages)
+		)
+		messages = messages[:MAX_SYNC_MESSAGES] + [
+			_("... and {0} more, see the Error Log").format(len(messages) - MAX_SYNC_MESSAGES)
+		]
+	
+	return {
+		"status": "success",
+		"message": f"Items sync completed. Created: {totals['synced_count']}, Updated: {totals['updated_count']}, Errors: {totals['error_count']}",
+		"messages": messages,
+		**totals
+	}
+
+
+@frappe.whitelist()
+def enqueue_item_sync(organization_id=None, per_page=None):
+	"""
+	Queue a full item sync as a background job and return straight away
+	
+	The result is sent to the calling user as a zoho_item_sync realtime
+	event once the job finishes.
+	"""
+	job = frappe.enqueue(
+		"zoho_integration.item.sync_items_job",
+		queue="long",
+		timeout=3600,
+		job_id="zoho_item_sync",
+		deduplicate=True,
+		organization_id=organization_id,
+		per_page=per_page,
+		user=frappe.session.user
+	)
+	
+	if not job:
+		return {"status": "queued", "message": _("An item sync is already running")}
+	
+	return {"status": "queued", "message": _("Item sync queued"), "job_id": job.id}
+
+
+def sync_items_job(organization_id=None, per_page=None, user=None):
+	"""
+	Background job queued by enqueue_item_sync
+	
+	The user is told about failures too, then the error is raised again so
+	the job is still recorded as failed.
+	"""
+	try:
+		result = sync_all_items(organization_id, per_page)
+	except Exception as e:
+		if user:
+			frappe.publish_realtime(
+				"zoho_item_sync",
+				{"status": "error", "message": cstr(e) or _("Item sync failed")},
+				user=user
+			)
+		raise
+	
+	if user:
+		frappe.publish_realtime("zoho_item_sync", result, user=user)
+
+
+def sync_item_batch(zoho_items):
+	"""
+	Create or update ERPNext Items from a list of Zoho items
+	
+	Existing items, UOMs and warehouses are looked up once for the whole
+	batch, so the loop itself only queries when it has to write.
+	"""
 	synced_count = 0
 	updated_count = 0
+	unchanged_count = 0
 	error_count = 0
+	created_names = []
+	updated_names = []
+	
+	# Warnings and errors are shown in one message after the batch
+	messages = []
+	
+	# Ensure item group exists
+	item_group = "Zoho Items"  # Default item group for Zoho items
+	if not frappe.db.exists("Item Group", item_group):
+		frappe.get_doc({
+			"doctype": "Item Group",
+			"item_group_name": item_group,
+			"parent_item_group": "All Item Groups",
+			"is_group": 0
+		}).insert()
+	
+	existing_items = get_existing_items(zoho_items)
+	known_uoms = set(frappe.get_all(
+		"UOM",
+		filters={"name": ["in", list({(z.get("unit") or "").strip() or "Nos" for z in zoho_items})]},
+		pluck="name"
+	))
+	known_warehouses = set(frappe.get_all("Warehouse", pluck="name"))
+	bin_qty = get_bin_quantities(existing_items)
+	default_warehouses = get_default_warehouses(existing_items)
+	item_meta = frappe.get_meta("Item")
+	fast_item_update = get_settings().fast_item_update
+	now = frappe.utils.now()
+	
+	# Stock changes are collected per item and posted once for the batch
+	reconciliation_rows = []
+	receipt_rows = []
 	
-	for zoho_item in zoho_items:
+	total_items = len(zoho_items)
+	
+	for processed, zoho_item in enumerate(zoho_items, 1):
+		get = zoho_item.get
+		
+		# Everything for one item runs in the page's transaction; a failing
+		# item rolls back to here instead of leaving half-written rows
+		frappe.db.savepoint("zoho_item")
+		created_uom = None
 		try:
-			# Ensure item group exists
-			item_group = "Zoho Items"  # Default item group for Zoho items
-			if not frappe.db.exists("Item Group", item_group):
-				frappe.get_doc({
-					"doctype": "Item Group",
-					"item_group_name": item_group,
-					"parent_item_group": "All Item Groups",
-					"is_group": 0
-				}).insert()
-			
 			# Ensure UOM exists
-			unit = zoho_item.get("unit") or "Nos"  # Default to "Nos" if empty
+			unit = get("unit") or "Nos"  # Default to "Nos" if empty
 			if not unit or unit.strip() == "":
 				unit = "Nos"
 			
-			if not frappe.db.exists("UOM", unit):
+			if unit not in known_uoms:
 				frappe.get_doc({
 					"doctype": "UOM",
 					"uom_name": unit,
 					"must_be_whole_number": 1
 				}).insert()
+				known_uoms.add(unit)
+				created_uom = unit
 			
 			# Map Zoho item to ERPNext item format
 			# Zoho Fields Mapping:
@@ -132,210 +279,360 @@ def sync_items_from_zoho_to_erpnext(organization_id=None, page=1, per_page=None,
 			# - purchase_rate: Cost Price (maps to valuation_rate)
 			# - inventory_valuation_method: FIFO/LIFO
 			
-			purchase_rate = zoho_item.get("purchase_rate", 0) or 0
-			selling_rate = zoho_item.get("rate", 0) or 0
+			purchase_rate = get("purchase_rate", 0) or 0
+			selling_rate = get("rate", 0) or 0
 			
 			# Map inventory valuation method from Zoho to ERPNext
-			zoho_valuation = zoho_item.get("inventory_valuation_method", "").upper()
-			erpnext_valuation = "FIFO"  # Default
-			if "LIFO" in zoho_valuation:
-				erpnext_valuation = "LIFO"
-			elif "FIFO" in zoho_valuation:
-				erpnext_valuation = "FIFO"
-			elif "AVERAGE" in zoho_valuation or "WEIGHTED" in zoho_valuation:
-				erpnext_valuation = "Moving Average"
+			zoho_valuation = (get("inventory_valuation_method") or "").upper()
+			erpnext_valuation = next(
+				(method for keyword, method in VALUATION_METHOD_KEYWORDS if keyword in zoho_valuation),
+				"FIFO"
+			)
 			
 			# Check if this is a new item or existing
-			existing_item = frappe.db.exists("Item", {"zoho_item_id": zoho_item.get("item_id")})
+			existing = existing_items.get(get("item_id"))
+			existing_item = existing.name if existing else None
 			
 			# For new items, always maintain stock. For existing items, keep their current setting
 			is_stock_item = 1  # Default to maintain stock for all new items
-			if existing_item:
+			if existing:
 				# For existing items, keep their current stock setting
-				is_stock_item = frappe.db.get_value("Item", existing_item, "is_stock_item") or 1
+				is_stock_item = existing.is_stock_item or 1
 			
 			erpnext_item_data = {
 				"doctype": "Item",
-				"item_code": zoho_item.get("sku") or zoho_item.get("item_id"),
-				"item_name": zoho_item.get("name"),
-				"description": zoho_item.get("description", ""),
+				"item_code": get("sku") or get("item_id"),
+				"item_name": get("name"),
+				# ERPNext fills a blank description with the item name on
+				# save; do the same so such items don't always compare changed
+				"description": get("description") or get("name"),
 				"stock_uom": unit,  # Use the validated unit
 				"is_stock_item": is_stock_item,  # Maintain stock for all new items
 				"valuation_rate": purchase_rate,  # Cost price from Zoho
 				"standard_rate": selling_rate,    # Selling price from Zoho
 				"valuation_method": erpnext_valuation,  # Always set valuation method
-				"disabled": 0 if zoho_item.get("status") == "active" else 1,
+				"disabled": 0 if get("status") == "active" else 1,
 				"is_sales_item": 1,  # Default to sales item
 				"is_purchase_item": 1,  # Default to purchase item
 				"item_group": item_group,
 				"purchase_uom": unit,  # Use the validated unit
 				"sales_uom": unit,     # Use the validated unit
-				"is_taxable": zoho_item.get("tax_percentage", 0) > 0,
+				"is_taxable": get("tax_percentage", 0) > 0,
 				"tax_category": "Standard",
-				"zoho_item_id": zoho_item.get("item_id"),
-				"zoho_sku": zoho_item.get("sku"),
-				"zoho_name": zoho_item.get("name"),
-				"zoho_account_id": zoho_item.get("account_id"),
-				"zoho_account_name": zoho_item.get("account_name", ""),
-				"zoho_purchase_account_id": zoho_item.get("purchase_account_id"),
-				"zoho_purchase_account_name": zoho_item.get("purchase_account_name", ""),
-				"zoho_inventory_account_id": zoho_item.get("inventory_account_id"),
-				"zoho_inventory_account_name": zoho_item.get("inventory_account_name", ""),
-				"zoho_item_type": zoho_item.get("item_type"),
-				"zoho_product_type": zoho_item.get("product_type"),
-				"zoho_track_inventory": zoho_item.get("track_inventory", False),
-				"zoho_stock_on_hand": zoho_item.get("stock_on_hand", 0),
-				"zoho_reorder_level": zoho_item.get("reorder_level", 0) or 0,
+				"zoho_item_id": get("item_id"),
+				"zoho_sku": get("sku"),
+				"zoho_name": get("name"),
+				"zoho_account_id": get("account_id"),
+				"zoho_account_name": get("account_name", ""),
+				"zoho_purchase_account_id": get("purchase_account_id"),
+				"zoho_purchase_account_name": get("purchase_account_name", ""),
+				"zoho_inventory_account_id": get("inventory_account_id"),
+				"zoho_inventory_account_name": get("inventory_account_name", ""),
+				"zoho_item_type": get("item_type"),
+				"zoho_product_type": get("product_type"),
+				"zoho_track_inventory": get("track_inventory", False),
+				"zoho_stock_on_hand": get("stock_on_hand", 0),
+				"zoho_reorder_level": get("reorder_level", 0) or 0,
 				"zoho_purchase_rate": purchase_rate,
 				"zoho_selling_rate": selling_rate,
-				"zoho_valuation_method": zoho_item.get("inventory_valuation_method", ""),
-				"zoho_last_synced": frappe.utils.now()
+				"zoho_valuation_method": get("inventory_valuation_method", ""),
+				"zoho_last_synced": now
 			}
 			
+			item_doc = None
 			if existing_item:
-				# Update existing item
-				item_doc = frappe.get_doc("Item", existing_item)
-				item_doc.update(erpnext_item_data)
-				item_doc.save()
-				updated_count += 1
-				frappe.msgprint(f"Updated item: {zoho_item.get('name')}")
+				# Update existing item, unless Zoho has nothing new for it;
+				# blank and zero values compare equal, the DB returns NULL for both.
+				# Compared against the preloaded row so unchanged items are
+				# never loaded as documents
+				changes = {
+					fieldname: value for fieldname, value in erpnext_item_data.items()
+					if fieldname != "zoho_last_synced" and item_meta.has_field(fieldname)
+					and (existing.get(fieldname) or None) != (value or None)
+				}
+				if not changes:
+					unchanged_count += 1
+				elif fast_item_update and all(
+					fieldname.startswith("zoho_") or fieldname in FAST_UPDATE_FIELDS for fieldname in changes
+				):
+					# Only plain columns differ, write them in one UPDATE and
+					# keep the preloaded row in step for the stock sync below
+					changes["zoho_last_synced"] = now
+					frappe.db.set_value("Item", existing_item, changes, update_modified=False)
+					existing.update(changes)
+					updated_count += 1
+					updated_names.append(existing_item)
+				else:
+					item_doc = frappe.get_doc("Item", existing_item)
+					item_doc.update(erpnext_item_data)
+					item_doc.save()
+					updated_count += 1
+					updated_names.append(item_doc.name)
 			else:
 				# Create new item
 				item_doc = frappe.get_doc(erpnext_item_data)
 				
-				# Add Item Defaults with warehouse (Stores - E for ETMS company)
+				# Add Item Defaults with warehouse
 				item_doc.append("item_defaults", {
-					"company": "Big Man Collections",
-					"default_warehouse": "Stores - BMC"
+					"company": DEFAULT_COMPANY,
+					"default_warehouse": DEFAULT_WAREHOUSE
 				})
 				
 				item_doc.insert()
 				synced_count += 1
-				frappe.msgprint(f"Created item: {zoho_item.get('name')}")
+				created_names.append(item_doc.name)
+			
+			# Stock fields come from the saved doc, or from the preloaded
+			# row when the item was unchanged or written directly
+			item = item_doc or existing
 			
 			# Update stock for items that maintain stock
-			if item_doc.is_stock_item and zoho_item.get("stock_on_hand") is not None:
+			if item.is_stock_item and get("stock_on_hand") is not None:
 				try:
-					zoho_qty = zoho_item.get("stock_on_hand", 0)
+					zoho_qty = get("stock_on_hand", 0)
 					# Use purchase_rate (cost price) for valuation, fallback to selling rate if not available
 					cost_rate = purchase_rate if purchase_rate > 0 else selling_rate
 					
-					# Get default warehouse from Item Defaults table
-					default_warehouse = None
-					if item_doc.item_defaults:
-						for item_default in item_doc.item_defaults:
-							if item_default.default_warehouse:
-								default_warehouse = item_default.default_warehouse
-								break
+					# New items get DEFAULT_WAREHOUSE, existing ones use
+					# the first warehouse in their Item Defaults table
+					if existing_item:
+						default_warehouse = default_warehouses.get(existing_item)
+					else:
+						default_warehouse = DEFAULT_WAREHOUSE
 					
 					# If no warehouse found in item defaults, skip stock update
 					if not default_warehouse:
-						frappe.msgprint(f"Warning: No default warehouse configured for item {zoho_item.get('name')}. Please set it in Item Defaults. Skipping stock update.")
+						messages.append(f"Warning: No default warehouse configured for item {get('name')}. Please set it in Item Defaults. Skipping stock update.")
 					elif existing_item:
 						# For existing items, use Stock Reconciliation to update quantities
 						# Get current stock quantity
 						
 						# Check if warehouse exists
-						if not frappe.db.exists("Warehouse", default_warehouse):
-							frappe.msgprint(f"Warning: Warehouse '{default_warehouse}' does not exist. Skipping stock update for {zoho_item.get('name')}")
+						if default_warehouse not in known_warehouses:
+							messages.append(f"Warning: Warehouse '{default_warehouse}' does not exist. Skipping stock update for {get('name')}")
 						else:
-							current_qty = frappe.db.get_value("Bin", 
-								{"item_code": item_doc.item_code, "warehouse": default_warehouse}, 
-								"actual_qty") or 0
+							current_qty = bin_qty.get((item.name, default_warehouse), 0.0)
 							
-							# Only create reconciliation if quantity has changed
-							if float(current_qty) != float(zoho_qty):
-								stock_reconciliation = frappe.get_doc({
-									"doctype": "Stock Reconciliation",
-									"purpose": "Stock Reconciliation",
-									"posting_date": frappe.utils.today(),
-									"posting_time": frappe.utils.now_datetime().strftime("%H:%M:%S"),
-									"items": [{
-										"item_code": item_doc.item_code,
-										"warehouse": default_warehouse,
-										"qty": zoho_qty,
-										"valuation_rate": cost_rate or item_doc.valuation_rate or 0
-									}]
+							# Only reconcile if quantity has changed
+							if abs(current_qty - flt(zoho_qty)) > 1e-9:
+								reconciliation_rows.append({
+									"item_code": item.item_code,
+									"warehouse": default_warehouse,
+									"qty": zoho_qty,
+									"valuation_rate": cost_rate or item.valuation_rate or 0
 								})
-								stock_reconciliation.insert()
-								stock_reconciliation.submit()
-								frappe.msgprint(f"Updated stock for {zoho_item.get('name')}: {current_qty} → {zoho_qty} units (Cost: {cost_rate})")
 					elif not existing_item:
 						# For new items, create opening stock entry
 						if zoho_qty > 0:
 							# Check if warehouse exists
-							if not frappe.db.exists("Warehouse", default_warehouse):
-								frappe.msgprint(f"Warning: Warehouse '{default_warehouse}' does not exist. Skipping stock creation for {zoho_item.get('name')}")
+							if default_warehouse not in known_warehouses:
+								messages.append(f"Warning: Warehouse '{default_warehouse}' does not exist. Skipping stock creation for {get('name')}")
 							else:
-								stock_entry = frappe.get_doc({
-									"doctype": "Stock Entry",
-									"stock_entry_type": "Material Receipt",
-									"posting_date": frappe.utils.today(),
-									"posting_time": frappe.utils.now_datetime().strftime("%H:%M:%S"),
-									"purpose": "Material Receipt",
-									"items": [{
-										"item_code": item_doc.item_code,
-										"qty": zoho_qty,
-										"t_warehouse": default_warehouse,
-										"basic_rate": cost_rate or 0,
-										"valuation_rate": cost_rate or 0
-									}]
+								receipt_rows.append({
+									"item_code": item.item_code,
+									"qty": zoho_qty,
+									"t_warehouse": default_warehouse,
+									"basic_rate": cost_rate or 0,
+									"valuation_rate": cost_rate or 0
 								})
-								stock_entry.insert()
-								stock_entry.submit()
-								frappe.msgprint(f"Created opening stock for {zoho_item.get('name')}: {zoho_qty} units (Cost: {cost_rate})")
 					
 				except Exception as e:
 					frappe.log_error(
 						title="Zoho Integration Issue",
-						message=f"Failed to update stock for {zoho_item.get('name')}: {str(e)}\nZoho Item: {zoho_item}"
+						message=f"Failed to update stock for {get('name')}: {str(e)}\nZoho Item: {zoho_item}"
 					)
-					frappe.msgprint(f"Warning: Could not update stock for {zoho_item.get('name')}: {str(e)}")
+					messages.append(f"Warning: Could not update stock for {get('name')}: {str(e)}")
 			
 		except Exception as e:
+			frappe.db.rollback(save_point="zoho_item")
+			if created_uom:
+				# The UOM was rolled back along with the item
+				known_uoms.discard(created_uom)
 			error_message = str(e)
 			
 			# Log detailed error information
 			frappe.log_error(
 				title="Zoho Integration Issue",
-				message=f"Failed to sync item {zoho_item.get('name')} from Zoho: {error_message}\nItem data: {zoho_item}"
+				message=f"Failed to sync item {get('name')} from Zoho: {error_message}\nItem data: {zoho_item}"
 			)
 			
 			# Show user-friendly error message
 			if "stock_uom" in error_message:
-				frappe.msgprint(f"Error with item {zoho_item.get('name')}: UOM issue - {error_message}")
+				messages.append(f"Error with item {get('name')}: UOM issue - {error_message}")
 			elif "UOM" in error_message:
-				frappe.msgprint(f"Error with item {zoho_item.get('name')}: Unit of Measure issue - {error_message}")
+				messages.append(f"Error with item {get('name')}: Unit of Measure issue - {error_message}")
 			elif "required" in error_message.lower():
-				frappe.msgprint(f"Error with item {zoho_item.get('name')}: Required field missing - {error_message}")
+				messages.append(f"Error with item {get('name')}: Required field missing - {error_message}")
 			else:
-				frappe.msgprint(f"Error with item {zoho_item.get('name')}: {error_message}")
+				messages.append(f"Error with item {get('name')}: {error_message}")
 			
 			error_count += 1
+		
+		publish_sync_progress(processed, total_items, "Item")
+	
+	post_stock_updates(reconciliation_rows, receipt_rows, messages)
+	
+	if messages:
+		frappe.msgprint("<br>".join(messages), title=_("Zoho Item Sync"))
 	
 	return {
 		"status": "success",
 		"message": f"Items sync completed. Created: {synced_count}, Updated: {updated_count}, Errors: {error_count}",
 		"synced_count": synced_count,
 		"updated_count": updated_count,
-		"error_count": error_count
+		"unchanged_count": unchanged_count,
+		"error_count": error_count,
+		"created_names": created_names,
+		"updated_names": updated_names,
+		"messages": messages
 	}
 
 
-@frappe.whitelist()
-def push_item_to_zoho(item_code):
+def post_stock_updates(reconciliation_rows, receipt_rows, messages):
 	"""
-	Push an item from ERPNext to Zoho Books
+	Post a batch's stock changes as Stock Reconciliations (existing items)
+	and Material Receipts (opening stock of new items) of up to
+	STOCK_ROWS_PER_DOC rows each
+	
+	Each document is inserted and submitted under its own savepoint, so a
+	failure rolls back only that document and leaves the synced items. The
+	rows of a failed document are then posted one per document, so a single
+	bad row only skips its own item. Outcomes are appended to messages for
+	the batch summary.
+	"""
+	posting_date = frappe.utils.today()
+	posting_time = frappe.utils.now_datetime().strftime("%H:%M:%S")
+	
+	stock_docs = []
+	for start in range(0, len(reconciliation_rows), STOCK_ROWS_PER_DOC):
+		stock_docs.append({
+			"doctype": "Stock Reconciliation",
+			"purpose": "Stock Reconciliation",
+			"items": reconciliation_rows[start:start + STOCK_ROWS_PER_DOC]
+		})
+	for start in range(0, len(receipt_rows), STOCK_ROWS_PER_DOC):
+		stock_docs.append({
+			"doctype": "Stock Entry",
+			"stock_entry_type": "Material Receipt",
+			"purpose": "Material Receipt",
+			"items": receipt_rows[start:start + STOCK_ROWS_PER_DOC]
+		})
+	
+	for stock_data in stock_docs:
+		stock_doc, error = post_stock_doc(stock_data, posting_date, posting_time)
+		if stock_doc:
+			messages.append(f"Created {stock_data['doctype']} {stock_doc.name} for {len(stock_data['items'])} Zoho items")
+			continue
+		
+		if len(stock_data["items"]) == 1:
+			rows = [(stock_data["items"][0], error)]
+		else:
+			# Find the failing rows by posting each one on its own
+			rows = []
+			for row in stock_data["items"]:
+				row_doc, row_error = post_stock_doc({**stock_data, "items": [row]}, posting_date, posting_time)
+				if not row_doc:
+					rows.append((row, row_error))
+			
+			if len(rows) < len(stock_data["items"]):
+				messages.append(
+					f"Created {stock_data['doctype']} entries for {len(stock_data['items']) - len(rows)} Zoho items one by one"
+				)
+		
+		for row, row_error in rows:
+			frappe.log_error(
+				title="Zoho Integration Issue",
+				message=f"Failed to post {stock_data['doctype']} for Zoho item {row['item_code']}: {str(row_error)}\nRow: {row}"
+			)
+			messages.append(f"Warning: Could not update stock for {row['item_code']}: {str(row_error)}")
+
+
+def post_stock_doc(stock_data, posting_date, posting_time):
 	"""
-	settings = frappe.get_doc("Zoho Books Settings", "Zoho Books Settings")
+	Insert and submit one stock document under a savepoint
 	
-	if not settings.access_token:
-		frappe.throw(_("Access token not available. Please complete OAuth setup first."))
+	Returns (doc, None) on success, or (None, exception) after rolling the
+	document back.
+	"""
+	frappe.db.savepoint("zoho_item_stock")
+	try:
+		stock_doc = frappe.get_doc({**stock_data, "posting_date": posting_date, "posting_time": posting_time})
+		stock_doc.insert()
+		stock_doc.submit()
+		return stock_doc, None
+	except Exception as e:
+		frappe.db.rollback(save_point="zoho_item_stock")
+		return None, e
+
+
+def get_bin_quantities(existing_items):
+	"""
+	Map (item_code, warehouse) -> actual_qty for the existing items of one
+	batch, in a single query
+	"""
+	item_codes = [row.name for row in existing_items.values()]
+	if not item_codes:
+		return {}
 	
-	organization_id = settings.organization_id
+	return {
+		(row.item_code, row.warehouse): flt(row.actual_qty)
+		for row in frappe.get_all(
+			"Bin",
+			filters={"item_code": ["in", item_codes]},
+			fields=["item_code", "warehouse", "actual_qty"]
+		)
+	}
+
+
+def get_default_warehouses(existing_items):
+	"""
+	Map item_code -> first default warehouse in Item Defaults for the
+	existing items of one batch, in a single query
+	"""
+	item_codes = [row.name for row in existing_items.values()]
+	if not item_codes:
+		return {}
+	
+	default_warehouses = {}
+	for row in frappe.get_all(
+		"Item Default",
+		filters={"parent": ["in", item_codes], "parenttype": "Item", "default_warehouse": ["is", "set"]},
+		fields=["parent", "default_warehouse"],
+		order_by="idx asc"
+	):
+		default_warehouses.setdefault(row.parent, row.default_warehouse)
+	
+	return default_warehouses
+
+
+def get_existing_items(zoho_items):
+	"""
+	Map Zoho item ID -> existing ERPNext Item row for the items of one
+	batch, in a single query
+	
+	Whole rows are loaded so the sync can tell unchanged items apart
+	without reading each one again.
+	"""
+	zoho_ids = [z.get("item_id") for z in zoho_items if z.get("item_id")]
+	if not zoho_ids:
+		return {}
 	
-	if not organization_id:
-		frappe.throw(_("Organization ID not configured"))
+	return {
+		row.zoho_item_id: row
+		for row in frappe.get_all(
+			"Item",
+			filters={"zoho_item_id": ["in", zoho_ids]},
+			fields=["*"]
+		)
+	}
+
+
+@frappe.whitelist()
+def push_item_to_zoho(item_code):
+	"""
+	Push an item from ERPNext to Zoho Books
+	"""
+	organization_id = get_organization_id()
 	
 	# Get item from ERPNext
 	item = frappe.get_doc("Item", item_code)
@@ -357,67 +654,25 @@ def push_item_to_zoho(item_code):
 		"Content-Type": "application/json"
 	}
 	
-	# Prepare item data
-	item_data = {
-		"name": item.item_name,
-		"description": item.description or "",
-		"unit": item.stock_uom or "Nos",
-		"item_type": "inventory" if item.is_stock_item else "service"
-	}
-	
-	# Add SKU if available
-	if item.item_code:
-		item_data["sku"] = item.item_code
-	
-	# Always send selling price (rate) if available
-	if item.standard_rate and item.standard_rate > 0:
-		item_data["rate"] = float(item.standard_rate)
-	else:
-		item_data["rate"] = 0
-	
-	# Always send purchase rate (valuation rate) if available
-	if item.valuation_rate and item.valuation_rate > 0:
-		item_data["purchase_rate"] = float(item.valuation_rate)
-	elif item.last_purchase_rate and item.last_purchase_rate > 0:
-		item_data["purchase_rate"] = float(item.last_purchase_rate)
-	else:
-		item_data["purchase_rate"] = 0
+	# For NEW stock items only, send opening stock from the default warehouse
+	opening_stock = 0
+	if item.is_stock_item and method == "POST":
+		default_warehouse = next(
+			(d.default_warehouse for d in item.item_defaults if d.default_warehouse),
+			None
+		)
+		if default_warehouse:
+			opening_stock = frappe.db.get_value("Bin",
+				{"item_code": item.item_code, "warehouse": default_warehouse},
+				"actual_qty") or 0
 	
-	# Add stock information if it's a stock item
-	if item.is_stock_item:
-		item_data["track_inventory"] = True
-		
-		# Get default warehouse from item defaults
-		default_warehouse = None
-		if item.item_defaults:
-			for item_default in item.item_defaults:
-				if item_default.default_warehouse:
-					default_warehouse = item_default.default_warehouse
-					break
-		
-		# For NEW items only, send opening stock
-		if method == "POST":
-			# Get opening stock from Stock Ledger Entry or current stock
-			opening_stock = 0
-			opening_stock_rate = item.valuation_rate or item.last_purchase_rate or 0
-			
-			if default_warehouse:
-				# Get current stock quantity from the default warehouse
-				stock_qty = frappe.db.get_value("Bin", 
-					{"item_code": item.item_code, "warehouse": default_warehouse}, 
-					"actual_qty") or 0
-				opening_stock = stock_qty
-			
-			# Send opening stock only if we have stock
-			if opening_stock > 0:
-				item_data["initial_stock"] = float(opening_stock)
-				item_data["initial_stock_rate"] = float(opening_stock_rate)
+	item_data = build_item_data(item, opening_stock)
 	
 	try:
 		response = make_zoho_api_request(method, url, headers=headers, json_data=item_data)
 		response.raise_for_status()
 		
-		item_response = response.json()
+		item_response = parse_zoho_response(response)
 		zoho_item = item_response.get("item", {})
 		zoho_item_id = zoho_item.get("item_id")
 		
@@ -453,27 +708,190 @@ def push_item_to_zoho(item_code):
 		frappe.throw(_(f"Failed to push item to Zoho Books: {str(e)}"))
 
 
-def push_item_on_submit(doc, method):
+def build_item_data(item, opening_stock=0):
+	"""
+	Build the Zoho item payload for an Item doc or row
+	
+	opening_stock is only sent for items not yet in Zoho.
+	"""
+	item_data = {
+		"name": item.item_name,
+		"description": item.description or "",
+		"unit": item.stock_uom or "Nos",
+		"item_type": "inventory" if item.is_stock_item else "service"
+	}
+	
+	# Add SKU if available
+	if item.item_code:
+		item_data["sku"] = item.item_code
+	
+	# Always send selling price (rate) if available
+	if item.standard_rate and item.standard_rate > 0:
+		item_data["rate"] = float(item.standard_rate)
+	else:
+		item_data["rate"] = 0
+	
+	# Always send purchase rate (valuation rate) if available
+	if item.valuation_rate and item.valuation_rate > 0:
+		item_data["purchase_rate"] = float(item.valuation_rate)
+	elif item.last_purchase_rate and item.last_purchase_rate > 0:
+		item_data["purchase_rate"] = float(item.last_purchase_rate)
+	else:
+		item_data["purchase_rate"] = 0
+	
+	# Add stock information if it's a stock item
+	if item.is_stock_item:
+		item_data["track_inventory"] = True
+		
+		# Send opening stock only if we have stock
+		if not item.zoho_item_id and opening_stock > 0:
+			item_data["initial_stock"] = float(opening_stock)
+			item_data["initial_stock_rate"] = float(item.valuation_rate or item.last_purchase_rate or 0)
+	
+	return item_data
+
+
+@frappe.whitelist()
+def bulk_push_items(item_codes):
+	"""
+	Push several items to Zoho Books concurrently
+	
+	Items, their default warehouses and opening stock are loaded in three
+	queries and the items are created/updated in parallel over the shared
+	session.
+	
+	Args:
+		item_codes: List (or JSON list) of Item codes
+	"""
+	item_codes = frappe.parse_json(item_codes) if isinstance(item_codes, str) else item_codes
+	if not item_codes:
+		return {"status": "success", "message": "No items to push", "pushed_count": 0, "error_count": 0, "errors": []}
+	
+	organization_id = get_organization_id()
+	
+	items = frappe.get_all(
+		"Item",
+		filters={"name": ["in", item_codes]},
+		fields=[
+			"name", "item_code", "item_name", "description", "stock_uom", "is_stock_item",
+			"standard_rate", "valuation_rate", "last_purchase_rate", "zoho_item_id"
+		]
+	)
+	
+	# First default warehouse of each new stock item, for its opening stock
+	new_stock_items = [i.name for i in items if i.is_stock_item and not i.zoho_item_id]
+	default_warehouses = {}
+	opening_stock = {}
+	if new_stock_items:
+		for row in frappe.get_all(
+			"Item Default",
+			filters={"parent": ["in", new_stock_items], "parenttype": "Item", "default_warehouse": ["is", "set"]},
+			fields=["parent", "default_warehouse"],
+			order_by="idx asc"
+		):
+			default_warehouses.setdefault(row.parent, row.default_warehouse)
+		
+		if default_warehouses:
+			for row in frappe.get_all(
+				"Bin",
+				filters={"item_code": ["in", list(default_warehouses)]},
+				fields=["item_code", "warehouse", "actual_qty"]
+			):
+				if default_warehouses[row.item_code] == row.warehouse:
+					opening_stock[row.item_code] = flt(row.actual_qty)
+	
+	headers = {
+		"X-com-zoho-books-organizationid": str(organization_id)
+	}
+	
+	responses = make_zoho_api_requests([
+		{
+			"method": "PUT" if i.zoho_item_id else "POST",
+			"url": f"{ITEMS_URL}/{i.zoho_item_id}" if i.zoho_item_id else ITEMS_URL,
+			"headers": headers,
+			"json_data": build_item_data(i, opening_stock.get(i.name, 0))
+		}
+		for i in items
+	], max_workers=PAGE_FETCH_WORKERS, return_exceptions=True)
+	
+	now = frappe.utils.now()
+	pushed_count = 0
+	errors = []
+	
+	# Items Zoho created are recorded even if other requests failed,
+	# so pushing again doesn't create them twice
+	for item, response in zip(items, responses):
+		try:
+			if isinstance(response, Exception):
+				raise response
+			response.raise_for_status()
+			zoho_item = parse_zoho_response(response).get("item", {})
+			if not zoho_item.get("item_id"):
+				frappe.throw(_("Failed to get item ID from Zoho response"))
+			
+			frappe.db.set_value("Item", item.name, {
+				"zoho_item_id": zoho_item.get("item_id"),
+				"zoho_name": zoho_item.get("name"),
+				"zoho_sku": zoho_item.get("sku"),
+				"zoho_last_synced": now
+			})
+			pushed_count += 1
+		except Exception as e:
+			errors.append({"item": item.name, "error": cstr(e)[:1000]})
+	
+	if errors:
+		frappe.log_error(
+			title="Zoho Item Push Failed",
+			message=f"Failed to push {len(errors)} items to Zoho:\n{json.dumps(errors, indent=1)}"
+		)
+	
+	return {
+		"status": "success",
+		"message": f"Items pushed to Zoho. Pushed: {pushed_count}, Errors: {len(errors)}",
+		"pushed_count": pushed_count,
+		"error_count": len(errors),
+		"errors": errors
+	}
+
+
+def enqueue_item_push(doc, method):
 	"""
 	Hook function to automatically push item to Zoho when submitted/saved
+	
+	The push runs in a background job once the save has committed, so the
+	user never waits on Zoho and rolled-back items are never pushed.
 	"""
 	try:
 		# Check if Zoho integration is enabled
-		settings = frappe.get_doc("Zoho Books Settings", "Zoho Books Settings")
+		settings = get_settings()
 		if settings.enabled and settings.auto_sync_item:
 			# Only push if not already synced to Zoho
 			if not doc.zoho_item_id:
-				result = push_item_to_zoho(doc.item_code)
-				
-				if result.get("status") == "success":
-					frappe.msgprint(f"Item synced to Zoho successfully: {result.get('zoho_item_id')}", alert=True)
-				else:
-					frappe.log_error(
-						title="Zoho Item Auto-Sync Failed",
-						message=f"Failed to auto-sync item {doc.item_code} to Zoho: {result.get('message')}"
-					)
+				frappe.enqueue(
+					"zoho_integration.item.push_item_job",
+					queue="short",
+					job_id=f"zoho_push_item::{doc.name}",
+					deduplicate=True,
+					enqueue_after_commit=True,
+					item_code=doc.name
+				)
 	except Exception as e:
 		frappe.log_error(
 			title="Zoho Integration Hook Error",
-			message=f"Error in push_item_on_submit hook: {str(e)}"
+			message=f"Error in enqueue_item_push hook: {str(e)}"
+		)
+
+
+def push_item_job(item_code):
+	"""
+	Background job queued by enqueue_item_push
+	"""
+	result = push_item_to_zoho(item_code)
+	
+	if result.get("status") != "success":
+		frappe.log_error(
+			title="Zoho Item Auto-Sync Failed",
+			message=f"Failed to auto-sync item {item_code} to Zoho: {result.get('message')}",
+			reference_doctype="Item",
+			reference_name=item_code
 		)
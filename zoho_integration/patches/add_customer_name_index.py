@@ -0,0 +1,7 @@
+import frappe
+
+
+def execute():
+	# The Zoho customer sync matches contacts to customers by name as well
+	# as by the (unique, hence indexed) zoho_contact_id
+	frappe.db.add_index("Customer", ["customer_name"])
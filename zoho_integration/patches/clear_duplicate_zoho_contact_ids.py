@@ -0,0 +1,27 @@
+import frappe
+
+
+def execute():
+	# Zoho Contact ID becomes unique on Customer, so only the oldest customer
+	# keeps a given ID and blank IDs are stored as NULL
+	if not frappe.db.has_column("Customer", "zoho_contact_id"):
+		return
+	
+	frappe.db.sql("UPDATE `tabCustomer` SET zoho_contact_id = NULL WHERE zoho_contact_id = ''")
+	
+	duplicate_ids = frappe.db.sql("""
+		SELECT zoho_contact_id FROM `tabCustomer`
+		WHERE zoho_contact_id IS NOT NULL
+		GROUP BY zoho_contact_id
+		HAVING COUNT(*) > 1
+	""", pluck=True)
+	
+	for zoho_contact_id in duplicate_ids:
+		customers = frappe.get_all(
+			"Customer",
+			filters={"zoho_contact_id": zoho_contact_id},
+			order_by="creation asc",
+			pluck="name"
+		)
+		for customer in customers[1:]:
+			frappe.db.set_value("Customer", customer, "zoho_contact_id", None, update_modified=False)
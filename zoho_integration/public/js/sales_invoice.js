@@ -1,4 +1,26 @@
 frappe.ui.form.on('Sales Invoice', {
+	onload: function(frm) {
+		// Result of the background sync queued on submit
+		frappe.realtime.off('zoho_invoice_sync');
+		frappe.realtime.on('zoho_invoice_sync', function(data) {
+			if (data.status === 'success') {
+				frappe.show_alert({
+					message: __('Invoice {0} sent to Zoho Books', [data.invoice_id]),
+					indicator: 'green'
+				});
+			} else {
+				frappe.show_alert({
+					message: __('Failed to send invoice {0} to Zoho: {1}', [data.invoice_id, data.message]),
+					indicator: 'red'
+				});
+			}
+			
+			if (frm.doc.name === data.invoice_id) {
+				frm.reload_doc();
+			}
+		});
+	},
+	
 	refresh: function(frm) {
 		// Add button to push invoice to Zoho
 		if (!frm.is_new() && frm.doc.docstatus === 1) {
@@ -47,6 +69,8 @@ frappe.ui.form.on('Sales Invoice', {
 			var color_map = {
 				'Synced': 'green',
 				'Not Synced': 'orange',
+				'Queued': 'blue',
+				'Processing': 'blue',
 				'Failed': 'red'
 			};
 			
@@ -2,6 +2,57 @@
 // For license information, please see license.txt
 
 frappe.ui.form.on("Zoho Books Settings", {
+	onload(frm) {
+		// Progress of the page being synced, sent every 50 records
+		frappe.realtime.off("zoho_sync_progress");
+		frappe.realtime.on("zoho_sync_progress", function(data) {
+			if (data.processed >= data.total) {
+				frappe.hide_progress();
+				return;
+			}
+			frappe.show_progress(__("Syncing {0} from Zoho Books", [__(data.doctype)]),
+				data.processed, data.total, __("{0} of {1} in this page", [data.processed, data.total]));
+		});
+		
+		// Result of the background customer sync
+		frappe.realtime.off("zoho_customer_sync");
+		frappe.realtime.on("zoho_customer_sync", function(data) {
+			if (data.status === "success") {
+				frappe.msgprint(__("Customers synced successfully! Created: {0}, Updated: {1}, Errors: {2}", 
+					[data.synced_count, data.updated_count, data.error_count]));
+				frm.set_value("last_sync_date", frappe.datetime.now_datetime());
+				frm.save();
+			} else {
+				frappe.msgprint({
+					title: __("Zoho Customer Sync Failed"),
+					message: data.message,
+					indicator: "red"
+				});
+			}
+		});
+		
+		// Result of the background item sync
+		frappe.realtime.off("zoho_item_sync");
+		frappe.realtime.on("zoho_item_sync", function(data) {
+			if (data.status === "success") {
+				var message = __("Items synced successfully! Created: {0}, Updated: {1}, Errors: {2}", 
+					[data.synced_count, data.updated_count, data.error_count]);
+				if (data.messages && data.messages.length) {
+					message += "<br><br>" + data.messages.join("<br>");
+				}
+				frappe.msgprint(message);
+				frm.set_value("last_sync_date", frappe.datetime.now_datetime());
+				frm.save();
+			} else {
+				frappe.msgprint({
+					title: __("Zoho Item Sync Failed"),
+					message: data.message,
+					indicator: "red"
+				});
+			}
+		});
+	},
+	
 	refresh(frm) {
 		if (!frm.doc.access_token) {
 			frm.add_custom_button(__("Setup OAuth"), function() {
@@ -48,18 +99,18 @@ frappe.ui.form.on("Zoho Books Settings", {
 			
 			frm.add_custom_button(__("Get Zoho Customers"), function() {
                         frappe.call({
-                            method: "zoho_integration.customer.sync_customers_from_zoho_to_erpnext",
+                            method: "zoho_integration.customer.enqueue_customer_sync",
                             args: {
                                 organization_id: frm.doc.organization_id,
                                 per_page: frm.doc.customers_per_page || 50,
                                 only_new: true
                             },
                             callback: function(r) {
-                                if (r.message && r.message.status === "success") {
-                                    frappe.msgprint(__("Customers synced successfully! Created: {0}, Updated: {1}, Errors: {2}", 
-                                        [r.message.synced_count, r.message.updated_count, r.message.error_count]));
-                                    frm.set_value("last_sync_date", frappe.datetime.now_datetime());
-                                    frm.save();
+                                if (r.message && r.message.status === "queued") {
+                                    frappe.show_alert({
+                                        message: r.message.message,
+                                        indicator: "blue"
+                                    });
                                 }
                             }
                         });
@@ -67,19 +118,17 @@ frappe.ui.form.on("Zoho Books Settings", {
 			
 			frm.add_custom_button(__("Get Zoho Items"), function() {
                         frappe.call({
-                            method: "zoho_integration.item.sync_items_from_zoho_to_erpnext",
+                            method: "zoho_integration.item.enqueue_item_sync",
                             args: {
                                 organization_id: frm.doc.organization_id,
-                                per_page: frm.doc.items_per_page || 50,
-                                sync_from_date: frm.doc.sync_from_date
+                                per_page: frm.doc.items_per_page || 50
                             },
                             callback: function(r) {
-                                if (r.message && r.message.status === "success") {
-                                    frappe.msgprint(__("Items synced successfully! Created: {0}, Updated: {1}, Errors: {2}", 
-                                        [r.message.synced_count, r.message.updated_count, r.message.error_count]));
-                                    // Update last sync date
-                                    frm.set_value("last_sync_date", frappe.datetime.now_datetime());
-                                    frm.save();
+                                if (r.message && r.message.status === "queued") {
+                                    frappe.show_alert({
+                                        message: r.message.message,
+                                        indicator: "blue"
+                                    });
                                 }
                             }
                         });
@@ -12,6 +12,19 @@ class ZohoBooksSettings(Document):
 		if self.enabled:
 			self.validate_oauth_setup()
 	
+	def on_update(self):
+		# Client secret or refresh token may have changed
+		from zoho_integration.auth import (
+			clear_settings_cache,
+			invalidate_token_cache,
+		)
+		
+		clear_settings_cache()
+		
+		# Password fields only hold a masked placeholder, so a changed
+		# refresh token can't be detected; saves are rare, always drop it
+		invalidate_token_cache()
+	
 	def validate_oauth_setup(self):
 		"""Validate OAuth setup"""
 		if not self.client_id: